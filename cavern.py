@@ -7,7 +7,10 @@ This is a refactored version of the Cavern game that uses:
 - Pause functionality
 - Improved code organization and maintainability
 """
+import atexit
+import json
 import sys
+import time
 import traceback
 
 try:
@@ -46,6 +49,10 @@ if pgzero_version < [1, 2]:
 # Import after version checks
 try:
     from src.constants import WIDTH as GAME_WIDTH, HEIGHT as GAME_HEIGHT, TITLE as GAME_TITLE
+    from src.constants import DIRTY_RECT_RENDERING, INPUT_RECORDING_PATH
+    from src.constants import PROFILING, PROFILE_TRACE_PATH
+    from src.constants import PRELOAD_ASSETS, STARTUP_REPORT_PATH, SOUND_CACHE_BYTES
+    from src.constants import FIXED_TIMESTEP, TICK_RATE, MAX_TICKS_PER_FRAME, RENDER_INTERPOLATION
     
     # Pygame Zero needs these as module-level globals
     WIDTH = GAME_WIDTH
@@ -60,7 +67,14 @@ except ImportError as e:
 
 try:
     from src.app import App
+    from src.assets import AssetPreloader, build_manifest
+    from src.atlas import install_atlas
+    from src.profiling import FrameProfiler
+    from src.recording import InputRecorder
+    from src.render import DirtyRectScreen
+    from src.rng import new_seed
     from src.sound import SoundManager
+    from src.timestep import FixedTimestep
 except ImportError as e:
     print(f"ERROR: Could not import from src: {e}")
     traceback.print_exc()
@@ -69,13 +83,67 @@ except ImportError as e:
 # Global app instance
 app = None
 sound_manager = None
+dirty_screen = None
+profiler = None
+preloader = None
+startup_time = None
+
+# Pygame Zero flips the whole display after every draw(). In dirty rect mode,
+# flip is replaced so that only the regions changed this frame are pushed.
+_display_flip = pygame.display.flip
+
+
+def flip_dirty_rects():
+    """Replacement for pygame.display.flip used in dirty rect mode."""
+    if dirty_screen is None or dirty_screen.dirty_rects is None:
+        _display_flip()
+    elif dirty_screen.dirty_rects:
+        pygame.display.update(dirty_screen.dirty_rects)
+
+
+def report_fill_rate():
+    """Print how much of the screen dirty rect mode pushed per frame."""
+    if dirty_screen is not None:
+        print(f"Dirty rects: {dirty_screen.frames} frames, "
+              f"{dirty_screen.fill_ratio():.1%} of screen pushed per frame on average")
+
+
+def report_profile():
+    """Print rolling frame time percentiles and close the profiler's trace."""
+    if profiler is not None:
+        times = profiler.percentiles()
+        if times:
+            print(f"Frame time over the last {len(profiler.frames)} frames: "
+                  f"p50 {times[50]:.2f} ms, p95 {times[95]:.2f} ms, p99 {times[99]:.2f} ms, "
+                  f"max {times['max']:.2f} ms")
+        profiler.close()
+
+
+def report_sound_cache():
+    """Print what the sound cache held and how long decoding took."""
+    stats = sound_manager.stats()
+    print(f"Sound cache: {stats['resident_bytes'] / 1024:.0f} KB resident "
+          f"({stats['pinned_bytes'] / 1024:.0f} KB pinned) of {stats['budget_bytes'] / 1024:.0f} KB, "
+          f"{stats['misses']} decodes in {stats['decode_seconds']:.3f}s, {stats['evictions']} evictions")
+
+
+def report_startup():
+    """Print how long startup took and what was preloaded, once preloading is done."""
+    global preloader
+    print(preloader.summary())
+    print(f"Startup took {time.perf_counter() - startup_time:.3f}s")
+    if STARTUP_REPORT_PATH:
+        with open(STARTUP_REPORT_PATH, "w") as f:
+            json.dump(preloader.report(slowest=len(preloader.manifest)), f, indent=1)
+    preloader = None
 
 
 def initialize():
     """Initialize the game."""
-    global app, sound_manager
+    global app, sound_manager, profiler, preloader, startup_time
     
     print("Initializing game...")
+    startup_time = time.perf_counter()
     
     # Set up sound system
     try:
@@ -97,39 +165,95 @@ def initialize():
         except Exception as e:
             print(f"Warning: Could not play music: {e}")
         
+        # Serve sprites from the packed texture atlas, if it has been built
+        atlas = install_atlas()
+        if atlas is not None:
+            print(f"Loaded {len(atlas.regions)} sprites from {len(atlas.sheets)} atlas sheet(s)")
+        
         # Create sound manager (sounds is a builtin)
-        sound_manager = SoundManager(sounds)
+        sound_manager = SoundManager(sounds, cache_bytes=SOUND_CACHE_BYTES)
+        if sound_manager.cache is not None:
+            try:
+                sound_manager.cache.preload_pinned()
+            except Exception as e:
+                print(f"Warning: Could not decode sounds: {e}")
+            atexit.register(report_sound_cache)
+        
+        if PROFILING:
+            profiler = FrameProfiler(trace_path=PROFILE_TRACE_PATH)
+            atexit.register(report_profile)
+            print("Profiling frames (F3 toggles the overlay)")
+        
+        timestep = FixedTimestep(TICK_RATE, MAX_TICKS_PER_FRAME) if FIXED_TIMESTEP else None
+        
+        # Create app, seeded and recording input if a recording was asked for
+        seed = recorder = None
+        if INPUT_RECORDING_PATH:
+            seed = new_seed()
+            recorder = InputRecorder(INPUT_RECORDING_PATH, seed)
+            atexit.register(recorder.close)
+            print(f"Recording input to {INPUT_RECORDING_PATH} (seed {seed})")
+        # Load everything else in the background while the loading screen shows
+        if PRELOAD_ASSETS:
+            # With a sound cache, sounds are decoded when the cache wants them
+            preloader = AssetPreloader(build_manifest(("image",)) if sound_manager.cache is not None else None)
+            preloader.start()
         
-        # Create app
-        app = App(sound_manager.play_sound)
+        app = App(sound_manager.play_sound, seed, recorder, profiler, timestep, RENDER_INTERPOLATION,
+                  preloader)
+        
+        if DIRTY_RECT_RENDERING:
+            pygame.display.flip = flip_dirty_rects
+            atexit.register(report_fill_rate)
     except Exception as e:
         print(f"ERROR during initialization: {e}")
         traceback.print_exc()
         raise
 
 
-def update():
+def update(dt):
     """Pygame Zero update callback."""
     global app
     try:
         if app is None:
             initialize()
-        app.update(keyboard)
+            # The first frame's dt includes loading time, so just tick once
+            dt = None
+        app.update(keyboard, dt)
+        # Play the sounds this frame's ticks asked for, once each
+        sound_manager.flush()
+        if preloader is not None and preloader.done:
+            report_startup()
     except Exception as e:
         print(f"ERROR in update(): {e}")
         traceback.print_exc()
         raise
 
 
+def on_key_down(key):
+    """Pygame Zero key press callback, for keys outside the game's own input."""
+    if key == keys.F3 and profiler is not None:
+        profiler.overlay = not profiler.overlay
+
+
 def draw():
     """Pygame Zero draw callback."""
-    global app
+    global app, dirty_screen
     try:
         if app is None:
             # Don't initialize in draw, wait for update
             screen.fill((0, 0, 0))
             return
-        app.draw(screen)
+        if DIRTY_RECT_RENDERING:
+            if dirty_screen is None or dirty_screen.surface is not screen.surface:
+                dirty_screen = DirtyRectScreen(screen)
+            if app.draw(dirty_screen):
+                dirty_screen.present()
+            else:
+                # Nothing changed, so push nothing
+                dirty_screen.dirty_rects = []
+        else:
+            app.draw(screen)
     except Exception as e:
         print(f"ERROR in draw(): {e}")
         traceback.print_exc()
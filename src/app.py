@@ -1,40 +1,122 @@
 """Main application class for Cavern game."""
+from time import perf_counter
+
 from src.input import InputManager
+from src.profiling import NULL_PROFILER
+from src.screens.loading import LoadingScreen
 from src.screens.menu import MenuScreen
+from src.timestep import PositionInterpolator
 
 
 class App:
     """Main application that manages screens and game flow."""
     
-    def __init__(self, play_sound_callback):
-        self.current_screen = MenuScreen()
-        self.input_manager = InputManager()
+    def __init__(self, play_sound_callback, seed=None, recorder=None, profiler=None,
+                 timestep=None, interpolate=False, preloader=None):
+        """
+        Args:
+            play_sound_callback: Function to call for sound effects
+            seed: Seed for every game played, or None for random games. With a
+                seed, the session is reproducible from its inputs alone.
+            recorder: Optional InputRecorder to log each tick's input to,
+                from the first tick after any loading screen (replays start
+                at the menu)
+            profiler: Optional FrameProfiler to time each frame with
+            timestep: Optional FixedTimestep deciding how many ticks each
+                update() runs; without one, every update() is one tick
+            interpolate: Draw entities between their last two tick positions
+                (only with a timestep)
+            preloader: Optional started AssetPreloader; a loading screen shows
+                until it finishes
+        """
+        self.profiler = profiler or NULL_PROFILER
+        self.current_screen = MenuScreen(seed, self.profiler)
+        self.input_manager = InputManager(recorder)
+        # How many ticks the loading screen shows depends on the loading
+        # thread, so they aren't recorded; the recorder is attached once the
+        # menu shows
+        self._pending_recorder = None
+        if preloader is not None:
+            self.current_screen = LoadingScreen(preloader, self.current_screen)
+            self.input_manager.recorder = None
+            self._pending_recorder = recorder
         self.play_sound_callback = play_sound_callback
+        
+        self.timestep = timestep
+        self.interpolator = PositionInterpolator() if timestep and interpolate else None
+        # Whether the screen has changed since it was last drawn
+        self._changed = True
     
     def change_screen(self, new_screen):
         """Change to a new screen."""
         if new_screen is not None:
             self.current_screen = new_screen
     
-    def update(self, keyboard):
+    def update(self, keyboard, dt=None):
         """
-        Update current screen.
+        Update current screen for one frame.
         
         Args:
             keyboard: Pygame Zero keyboard object
+            dt: Seconds since the previous frame. With a timestep, this
+                decides how many ticks run (possibly none); otherwise, or if
+                dt is None, exactly one tick runs.
         """
-        # Get input state for this frame
-        input_state = self.input_manager.get_input_state(keyboard)
+        profiler = self.profiler
+        profiler.begin_frame()
+        start = perf_counter()
+        
+        if self.timestep is None or dt is None:
+            ticks = 1
+        else:
+            ticks = self.timestep.advance(dt)
+        
+        for tick in range(ticks):
+            if tick == ticks - 1 and self.interpolator is not None:
+                game = getattr(self.current_screen, "game", None)
+                if game is not None:
+                    self.interpolator.capture(game)
+            if self._pending_recorder is not None and not isinstance(self.current_screen, LoadingScreen):
+                self.input_manager.recorder = self._pending_recorder
+                self._pending_recorder = None
+            # Input is sampled every tick, so presses are seen (and recorded) once
+            self.step(self.input_manager.get_input_state(keyboard))
         
+        profiler.add("update", perf_counter() - start)
+    
+    def step(self, input_state):
+        """
+        Run one tick with an already built InputState.
+        
+        Args:
+            input_state: InputState for this tick, e.g. from a replay
+        """
         # Update current screen and handle screen transitions
         next_screen = self.current_screen.update(input_state, self.play_sound_callback)
         self.change_screen(next_screen)
+        self._changed = True
     
     def draw(self, screen):
         """
-        Draw current screen.
+        Draw current screen, unless it would look the same as last time.
         
         Args:
             screen: Pygame Zero screen object
+            
+        Returns:
+            True if anything was drawn; if not, the screen still shows the
+            previous frame
         """
-        self.current_screen.draw(screen)
+        if not self._changed and self.interpolator is None:
+            return False
+        
+        start = perf_counter()
+        game = getattr(self.current_screen, "game", None)
+        if self.interpolator is not None and game is not None:
+            with self.interpolator.interpolated(game, self.timestep.alpha):
+                self.current_screen.draw(screen)
+        else:
+            self.current_screen.draw(screen)
+        self._changed = False
+        self.profiler.add("draw", perf_counter() - start)
+        return True
@@ -0,0 +1,202 @@
+"""
+Asset manifest and background preloading.
+
+Pygame Zero loads each image and sound the first time its name is used,
+which stalls that frame: the first bolt fired, orb popped or new level. An
+AssetPreloader loads (and converts, for images) everything in the manifest
+on a background thread into Pygame Zero's loader caches while the loading
+screen shows, so later uses are cache hits. It also times every asset for
+a startup report.
+
+Usage (headless: loads everything and prints the report):
+    python -m src.assets [--manifest assets.json] [--report startup.json]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from src.sprites import IMAGES_DIR
+
+ROOT_DIR = os.path.dirname(IMAGES_DIR)
+SOUNDS_DIR = os.path.join(ROOT_DIR, "sounds")
+
+# Asset kinds: directory and file extension of each
+KINDS = {"image": (IMAGES_DIR, ".png"), "sound": (SOUNDS_DIR, ".ogg")}
+
+# One asset: kind, Pygame Zero name and file size in bytes
+Asset = namedtuple("Asset", ("kind", "name", "bytes"))
+
+
+def build_manifest(kinds=tuple(KINDS)):
+    """
+    List every asset the game can load.
+
+    Args:
+        kinds: Asset kinds to include
+
+    Returns:
+        List of Asset, images then sounds, each sorted by name
+    """
+    manifest = []
+    for kind in kinds:
+        directory, extension = KINDS[kind]
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(extension):
+                path = os.path.join(directory, filename)
+                manifest.append(Asset(kind, filename[:-len(extension)], os.path.getsize(path)))
+    return manifest
+
+
+def _loaders():
+    from pgzero.loaders import images, sounds
+    return {"image": images.load, "sound": sounds.load}
+
+
+class AssetPreloader:
+    """Loads every asset in a manifest into Pygame Zero's caches."""
+
+    def __init__(self, manifest=None):
+        """
+        Args:
+            manifest: List of Asset to load (default: build_manifest())
+        """
+        self.manifest = build_manifest() if manifest is None else manifest
+        self.total_bytes = sum(asset.bytes for asset in self.manifest)
+        self.loaded_bytes = 0
+        self.loaded = 0
+
+        # Seconds spent on each asset, and the error for any that failed
+        self.timings = {}
+        self.failures = {}
+        self.seconds = None
+
+        # Error that stopped the load part way, if any
+        self.error = None
+
+        self._thread = None
+
+    @property
+    def progress(self):
+        """Fraction of the manifest loaded so far, by size."""
+        if self.total_bytes == 0:
+            return 1.0
+        return self.loaded_bytes / self.total_bytes
+
+    @property
+    def done(self):
+        return self.seconds is not None
+
+    def start(self):
+        """Start loading on a background thread."""
+        self._thread = threading.Thread(target=self.load_all, name="asset-preloader", daemon=True)
+        self._thread.start()
+
+    def load_all(self):
+        """
+        Load every asset on this thread.
+
+        Assets that fail to load (e.g. sounds when there is no audio device)
+        are recorded in failures; the game loads them lazily, as before.
+        Any other error stops the load and is kept in error. Either way the
+        load ends up done, so the loading screen never waits forever.
+        """
+        start = time.perf_counter()
+        try:
+            load = _loaders()
+            for asset in self.manifest:
+                asset_start = time.perf_counter()
+                try:
+                    load[asset.kind](asset.name)
+                except Exception as e:
+                    self.failures[asset] = str(e)
+                self.timings[asset] = time.perf_counter() - asset_start
+                self.loaded_bytes += asset.bytes
+                self.loaded += 1
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.seconds = time.perf_counter() - start
+
+    def wait(self, timeout=None):
+        """Block until background loading has finished."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def report(self, slowest=5):
+        """
+        Summarise the load.
+
+        Args:
+            slowest: Number of slowest assets to list
+
+        Returns:
+            Dict of totals, per-kind counts and seconds, the slowest assets,
+            failures and the error that stopped the load (or None)
+        """
+        kinds = {}
+        for asset, seconds in self.timings.items():
+            totals = kinds.setdefault(asset.kind, {"count": 0, "bytes": 0, "seconds": 0.0})
+            totals["count"] += 1
+            totals["bytes"] += asset.bytes
+            totals["seconds"] += seconds
+        ranked = sorted(self.timings.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "assets": self.loaded,
+            "bytes": self.loaded_bytes,
+            "seconds": self.seconds,
+            "kinds": kinds,
+            "slowest": [{"kind": asset.kind, "name": asset.name, "ms": seconds * 1000}
+                        for asset, seconds in ranked[:slowest]],
+            "failures": {f"{asset.kind}:{asset.name}": error for asset, error in self.failures.items()},
+            "error": self.error,
+        }
+
+    def summary(self):
+        """One line describing the load, for printing at startup."""
+        if self.error is not None and self.loaded == 0:
+            return f"Preloading failed: {self.error}"
+        report = self.report(slowest=3)
+        kinds = ", ".join(f"{totals['count']} {kind}s" for kind, totals in report["kinds"].items())
+        slowest = ", ".join(f"{item['name']} {item['ms']:.1f}ms" for item in report["slowest"])
+        line = (f"Preloaded {kinds} ({report['bytes'] / 1024:.0f} KB) in {report['seconds']:.3f}s; "
+                f"slowest: {slowest}")
+        if report["failures"]:
+            line += f"; {len(report['failures'])} failed"
+        if self.error is not None:
+            line += f"; stopped after {self.loaded} of {len(self.manifest)} by {self.error}"
+        return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preload every asset headlessly and report the time taken.")
+    parser.add_argument("--manifest", metavar="PATH", help="write the asset manifest as JSON")
+    parser.add_argument("--report", metavar="PATH", help="write the startup report as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from src.render import offscreen_screen
+    offscreen_screen()
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Warning: no audio, sounds will not load: {e}")
+
+    preloader = AssetPreloader()
+    if args.manifest:
+        with open(args.manifest, "w") as f:
+            json.dump([asset._asdict() for asset in preloader.manifest], f, indent=1)
+    preloader.load_all()
+    print(preloader.summary())
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(preloader.report(slowest=len(preloader.manifest)), f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Texture atlas: the small sprites in images/ packed into a few large sheets.
+
+The build step packs every sprite up to MAX_SPRITE_SIZE pixels across into
+sheets (backgrounds and other full-screen images stay as they are) and
+writes them with a JSON index of where each sprite is. At startup,
+install_atlas() loads the sheets and puts a subsurface of them for each
+sprite into Pygame Zero's image cache, so every screen.blit("name") and
+images.load("name") gets its pixels from one surface, without opening a
+file per sprite.
+
+The built atlas is not checked in; if it is missing or older than any of
+the images, sprites are loaded one file at a time as before.
+
+Usage:
+    python -m src.atlas [--sheet-size 1024] [--max-sprite 128]
+"""
+import argparse
+import json
+import os
+
+import pygame
+
+from src.sprites import IMAGES_DIR
+
+ATLAS_DIR = os.path.join(IMAGES_DIR, "atlas")
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+# Largest sprite (in either dimension) put into the atlas
+MAX_SPRITE_SIZE = 128
+
+# Width and height of each sheet
+SHEET_SIZE = 1024
+
+# Empty pixels around each sprite, so regions never touch
+PADDING = 1
+
+
+def _source_images(images_dir):
+    """Names of the PNG images directly in images_dir, sorted."""
+    return sorted(name[:-4] for name in os.listdir(images_dir) if name.endswith(".png"))
+
+
+def pack(sizes, sheet_size=SHEET_SIZE, padding=PADDING):
+    """
+    Place rectangles on as few sheets as possible, in rows ("shelves").
+
+    Args:
+        sizes: Dict of name -> (width, height)
+        sheet_size: Width and height of each sheet
+        padding: Gap to leave around each rectangle
+
+    Returns:
+        Dict of name -> (sheet index, x, y)
+    """
+    # Tallest first, so each shelf wastes little height
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], -sizes[name][0], name))
+    placements = {}
+    sheet = x = y = shelf_height = 0
+    for name in order:
+        width, height = sizes[name]
+        width += padding * 2
+        height += padding * 2
+        if width > sheet_size or height > sheet_size:
+            raise ValueError(f"'{name}' is larger than a {sheet_size}x{sheet_size} sheet")
+        if x + width > sheet_size:
+            # Next shelf
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        if y + height > sheet_size:
+            # Next sheet
+            sheet += 1
+            x = y = shelf_height = 0
+        placements[name] = (sheet, x + padding, y + padding)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return placements
+
+
+def build_atlas(images_dir=IMAGES_DIR, out_dir=ATLAS_DIR, sheet_size=SHEET_SIZE,
+                max_sprite=MAX_SPRITE_SIZE):
+    """
+    Pack the sprites in images_dir into sheets and write them with an index.
+
+    Args:
+        images_dir: Directory of source PNGs
+        out_dir: Directory to write sheet PNGs and index.json to
+        sheet_size: Width and height of each sheet
+        max_sprite: Largest sprite dimension to pack; bigger images are left out
+
+    Returns:
+        The index, as written to index.json
+    """
+    surfaces = {}
+    for name in _source_images(images_dir):
+        surface = pygame.image.load(os.path.join(images_dir, name + ".png"))
+        if max(surface.get_size()) <= max_sprite:
+            surfaces[name] = surface
+
+    placements = pack({name: surface.get_size() for name, surface in surfaces.items()}, sheet_size)
+    sheet_count = max((sheet for sheet, _, _ in placements.values()), default=-1) + 1
+    sheets = [pygame.Surface((sheet_size, sheet_size), pygame.SRCALPHA) for _ in range(sheet_count)]
+
+    sprites = {}
+    for name, (sheet, x, y) in sorted(placements.items()):
+        surface = surfaces[name]
+        sheets[sheet].blit(surface, (x, y))
+        sprites[name] = [sheet, x, y, surface.get_width(), surface.get_height()]
+
+    os.makedirs(out_dir, exist_ok=True)
+    sheet_names = []
+    for i, sheet in enumerate(sheets):
+        sheet_name = f"sheet{i}.png"
+        pygame.image.save(sheet, os.path.join(out_dir, sheet_name))
+        sheet_names.append(sheet_name)
+
+    index = {"version": INDEX_VERSION, "sheet_size": sheet_size, "sheets": sheet_names,
+             "sprites": sprites}
+    with open(os.path.join(out_dir, INDEX_NAME), "w") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    return index
+
+
+class TextureAtlas:
+    """Loaded atlas sheets, serving each sprite as a subsurface."""
+
+    def __init__(self, sheets, sprites):
+        """
+        Args:
+            sheets: List of sheet Surfaces
+            sprites: Dict of name -> (sheet index, x, y, width, height)
+        """
+        self.sheets = sheets
+        self.regions = {name: (sheets[sheet], pygame.Rect(x, y, width, height))
+                        for name, (sheet, x, y, width, height) in sprites.items()}
+        self._subsurfaces = {}
+
+    @classmethod
+    def load(cls, directory=ATLAS_DIR):
+        """
+        Load a built atlas.
+
+        Raises:
+            FileNotFoundError: If no atlas has been built
+            ValueError: If the index is from an incompatible version
+        """
+        with open(os.path.join(directory, INDEX_NAME)) as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION:
+            raise ValueError(f"atlas index version {index.get('version')} is not {INDEX_VERSION}; "
+                             f"rebuild it with python -m src.atlas")
+
+        sheets = []
+        for sheet_name in index["sheets"]:
+            sheet = pygame.image.load(os.path.join(directory, sheet_name))
+            if pygame.display.get_surface() is not None:
+                sheet = sheet.convert_alpha()
+            sheets.append(sheet)
+        return cls(sheets, index["sprites"])
+
+    def __contains__(self, name):
+        return name in self.regions
+
+    def region(self, name):
+        """Return (sheet, rect) for blitting a sprite with an area argument."""
+        return self.regions[name]
+
+    def get(self, name):
+        """Return a sprite as a subsurface sharing its sheet's pixels."""
+        surface = self._subsurfaces.get(name)
+        if surface is None:
+            sheet, rect = self.regions[name]
+            surface = self._subsurfaces[name] = sheet.subsurface(rect)
+        return surface
+
+    def install(self, loader=None):
+        """
+        Make a Pygame Zero image loader return atlas sprites.
+
+        Args:
+            loader: ResourceLoader to fill (default: pgzero.loaders.images)
+        """
+        if loader is None:
+            from pgzero.loaders import images as loader
+        for name in self.regions:
+            loader.cache[loader.cache_key(name, (), {})] = self.get(name)
+
+
+def is_stale(directory=ATLAS_DIR, images_dir=IMAGES_DIR):
+    """True if there is no built atlas, or an image has changed since it was built."""
+    try:
+        built = os.path.getmtime(os.path.join(directory, INDEX_NAME))
+    except OSError:
+        return True
+    return any(os.path.getmtime(os.path.join(images_dir, name + ".png")) > built
+               for name in _source_images(images_dir))
+
+
+def install_atlas(directory=ATLAS_DIR):
+    """
+    Serve sprites from the built atlas, if there is an up-to-date one.
+
+    Returns:
+        The installed TextureAtlas, or None if sprites will be loaded from
+        their own files
+    """
+    if is_stale(directory):
+        return None
+    atlas = TextureAtlas.load(directory)
+    atlas.install()
+    return atlas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack the sprites in images/ into atlas sheets.")
+    parser.add_argument("--sheet-size", type=int, default=SHEET_SIZE, help="sheet width and height")
+    parser.add_argument("--max-sprite", type=int, default=MAX_SPRITE_SIZE,
+                        help="largest sprite dimension to pack")
+    parser.add_argument("--out", default=ATLAS_DIR, help="output directory")
+    args = parser.parse_args(argv)
+
+    index = build_atlas(out_dir=args.out, sheet_size=args.sheet_size, max_sprite=args.max_sprite)
+    used = sum(width * height for _, _, _, width, height in index["sprites"].values())
+    total = len(index["sheets"]) * args.sheet_size ** 2
+    print(f"Packed {len(index['sprites'])} sprites into {len(index['sheets'])} "
+          f"{args.sheet_size}x{args.sheet_size} sheet(s) in {args.out} ({used / total:.0%} used)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,759 @@
+"""
+Batched multi-world simulation for Cavern (requires NumPy).
+
+BatchedGame holds N independent games as struct-of-arrays: every entity
+field is an (N, capacity) array and each world keeps its entity lists
+packed in the same order the scalar Game keeps its Python lists. Updates
+loop over entity *slots* in Python (a handful per world) and vectorize over
+*worlds*, so the in-frame ordering of the scalar Game.update - which orb a
+robot traps first, which bolt hurts the player - is preserved exactly.
+
+Random draws still happen one at a time from a per-world random.Random, in
+the same order as the scalar code. World w therefore matches a scalar
+Game(Player(), seed=seeds[w]) fed the same inputs. Sound effects are not emitted.
+
+Usage:
+    python -m src.batch --worlds 256 --frames 1000 --seed 0 [--verify]
+"""
+import argparse
+import time
+from dataclasses import fields
+
+import numpy as np
+
+from src.constants import (LEVELS, NUM_ROWS, NUM_COLUMNS, GRID_BLOCK_SIZE, LEVEL_X_OFFSET,
+                           WIDTH, HEIGHT)
+from src.entities.base import GravityActor
+from src.entities.bolt import Bolt
+from src.entities.effects import Pop
+from src.entities.fruit import Fruit
+from src.entities.orb import Orb
+from src.entities.player import Player
+from src.entities.robot import Robot
+from src.input import InputState
+from src.level import COMPILED_LEVELS
+from src.rng import make_rng
+from src.sprites import sprite_size
+
+# Column order of the (N, 7) input array
+INPUT_FIELDS = [f.name for f in fields(InputState)]
+_LEFT, _RIGHT, _UP, _JUMP, _FIRE_PRESSED, _FIRE_HELD, _PAUSE = range(len(INPUT_FIELDS))
+
+# Sprite table: every image the simulation can select, by integer id
+SPRITE_NAMES = []
+SPRITE_ID = {}
+
+
+def _sprite_ids(names):
+    """Map a (nested) list of sprite names from an entity class to an id array."""
+    def lookup(name):
+        if name not in SPRITE_ID:
+            SPRITE_ID[name] = len(SPRITE_NAMES)
+            SPRITE_NAMES.append(name)
+        return SPRITE_ID[name]
+    if isinstance(names, str):
+        return lookup(names)
+    return np.array([_sprite_ids(item) for item in names])
+
+
+BLANK = _sprite_ids("blank")
+STILL = _sprite_ids("still")
+RECOIL_IMG = _sprite_ids(Player.RECOIL_IMAGES)
+FALL_IMG = _sprite_ids(Player.FALL_IMAGES)
+BLOW_IMG = _sprite_ids(Player.BLOW_IMAGES)
+RUN_IMG = _sprite_ids(Player.RUN_IMAGES)
+ROBOT_IMG = _sprite_ids(Robot.IMAGES)
+FRUIT_IMG = _sprite_ids(Fruit.IMAGES)  # indexed by animation phase
+ORB_IMG = _sprite_ids(Orb.GROW_IMAGES + Orb.FLOAT_IMAGES)
+TRAP_IMG = _sprite_ids(Orb.TRAP_IMAGES)
+POP_IMG = _sprite_ids(Pop.IMAGES)
+BOLT_IMG = _sprite_ids(Bolt.IMAGES)
+SPRITE_W = np.array([sprite_size(name)[0] for name in SPRITE_NAMES], dtype=np.int64)
+SPRITE_H = np.array([sprite_size(name)[1] for name in SPRITE_NAMES], dtype=np.int64)
+
+NORMAL_FRUIT_TYPES = [Fruit.APPLE, Fruit.RASPBERRY, Fruit.LEMON]
+BONUS_FRUIT_TYPES = (10 * [Fruit.APPLE, Fruit.RASPBERRY, Fruit.LEMON] +
+                     9 * [Fruit.EXTRA_HEALTH] + [Fruit.EXTRA_LIFE])
+
+
+# Per-level (NUM_ROWS, NUM_COLUMNS) solidity masks, shared with the scalar Game
+LEVEL_MASKS = np.array([np.frombuffer(bytes(grid.solid), dtype=np.uint8)
+                        .reshape(NUM_ROWS, NUM_COLUMNS).astype(bool)
+                        for grid in COMPILED_LEVELS])
+
+
+def _sign(a):
+    """Vectorized src.utils.sign."""
+    return np.where(a < 0, -1, 1)
+
+
+class _EntityArrays:
+    """Struct-of-arrays storage for one entity type across all worlds."""
+
+    def __init__(self, num_worlds, capacity, **spec):
+        """
+        Args:
+            num_worlds: Number of worlds
+            capacity: Initial number of slots per world
+            spec: field name -> (dtype, default value)
+        """
+        self.spec = spec
+        self.count = np.zeros(num_worlds, dtype=np.int64)
+        for name, (dtype, default) in spec.items():
+            setattr(self, name, np.full((num_worlds, capacity), default, dtype=dtype))
+
+    @property
+    def capacity(self):
+        return getattr(self, next(iter(self.spec))).shape[1]
+
+    def _grow(self, capacity):
+        for name, (dtype, default) in self.spec.items():
+            old = getattr(self, name)
+            new = np.full((old.shape[0], capacity), default, dtype=dtype)
+            new[:, :old.shape[1]] = old
+            setattr(self, name, new)
+
+    def append(self, worlds, **values):
+        """Append one entity to the end of each listed world's list."""
+        slots = self.count[worlds]
+        if slots.size == 0:
+            return slots
+        if slots.max() >= self.capacity:
+            self._grow(max(2 * self.capacity, slots.max() + 1))
+        for name, (dtype, default) in self.spec.items():
+            getattr(self, name)[worlds, slots] = values.get(name, default)
+        self.count[worlds] += 1
+        return slots
+
+    def live(self, k):
+        """Mask of worlds that have an entity in slot k."""
+        return k < self.count
+
+    def compact(self, keep):
+        """
+        Remove entities where keep is False, preserving order.
+
+        Returns:
+            (N, capacity) array mapping old slot -> new slot (-1 if removed)
+        """
+        keep = keep & (np.arange(self.capacity) < self.count[:, None])
+        order = np.argsort(~keep, axis=1, kind="stable")
+        for name in self.spec:
+            arr = getattr(self, name)
+            arr[:] = np.take_along_axis(arr, order, axis=1)
+        self.count = keep.sum(axis=1)
+        return np.where(keep, np.cumsum(keep, axis=1) - 1, -1)
+
+
+class BatchedGame:
+    """N independent Cavern games advanced together with NumPy."""
+
+    def __init__(self, num_worlds, seeds=None):
+        """
+        Args:
+            num_worlds: Number of worlds
+            seeds: Per-world seeds (defaults to 0..num_worlds-1)
+        """
+        n = self.num_worlds = num_worlds
+        if seeds is None:
+            seeds = range(num_worlds)
+        self.rngs = [make_rng(seed) for seed in seeds]
+        self.worlds = np.arange(n)
+
+        self.timer = np.full(n, -1, dtype=np.int64)
+        self.level = np.full(n, -1, dtype=np.int64)
+        self.level_colour = np.full(n, -1, dtype=np.int64)
+        self.grid = np.zeros((n, NUM_ROWS, NUM_COLUMNS), dtype=bool)
+        self.pending_enemies = [[] for _ in range(n)]
+
+        # Player fields, one per world
+        self.player_x = np.zeros(n)
+        self.player_y = np.zeros(n)
+        self.player_vel_y = np.zeros(n, dtype=np.int64)
+        self.player_landed = np.zeros(n, dtype=bool)
+        self.player_direction = np.ones(n, dtype=np.int64)
+        self.player_fire_timer = np.zeros(n, dtype=np.int64)
+        self.player_hurt_timer = np.zeros(n, dtype=np.int64)
+        self.player_health = np.zeros(n, dtype=np.int64)
+        self.player_lives = np.full(n, 2, dtype=np.int64)
+        self.player_score = np.zeros(n, dtype=np.int64)
+        self.player_blowing = np.full(n, -1, dtype=np.int64)  # orb slot, -1 = None
+        self.player_img = np.full(n, BLANK, dtype=np.int64)
+
+        f, i, b = np.float64, np.int64, bool
+        self.fruits = _EntityArrays(n, 8, x=(f, 0), y=(f, 0), vel_y=(i, 0), landed=(b, False),
+                                    type=(i, 0), time_to_live=(i, 500), img=(i, BLANK))
+        self.bolts = _EntityArrays(n, 8, x=(f, 0), y=(f, 0), direction=(i, 1),
+                                   active=(b, True), img=(i, BLANK))
+        self.robots = _EntityArrays(n, 8, x=(f, 0), y=(f, 0), vel_y=(i, 0), landed=(b, False),
+                                    type=(i, 0), speed=(i, 1), direction=(i, 1), alive=(b, True),
+                                    change_dir_timer=(i, 0), fire_timer=(i, 100),
+                                    img=(i, BLANK))
+        self.pops = _EntityArrays(n, 8, x=(f, 0), y=(f, 0), type=(i, 0), timer=(i, -1),
+                                  img=(i, BLANK))
+        self.orbs = _EntityArrays(n, 8, x=(f, 0), y=(f, 0), direction=(i, 1),
+                                  floating=(b, False), trapped=(i, -1), timer=(i, -1),
+                                  blown_frames=(i, 6), img=(i, BLANK))
+
+        all_worlds = np.ones(n, dtype=bool)
+        self._reset_player(all_worlds)
+        for w in range(n):
+            self._next_level(w)
+
+    # ------------------------------------------------------------------
+    # Shared movement helpers
+
+    def _block(self, x, y):
+        """Vectorized src.utils.block for one point per world."""
+        grid_x = (x - LEVEL_X_OFFSET) // GRID_BLOCK_SIZE
+        grid_y = y // GRID_BLOCK_SIZE
+        valid = (grid_y > 0) & (grid_y < NUM_ROWS) & (grid_x >= 0) & (grid_x < NUM_COLUMNS)
+        return valid & self.grid[self.worlds,
+                                 np.clip(grid_y, 0, NUM_ROWS - 1),
+                                 np.clip(grid_x, 0, NUM_COLUMNS - 1)]
+
+    def _move(self, x, y, dx, dy, speed, mask):
+        """
+        Vectorized CollideActor.move for one entity per world.
+
+        Returns:
+            (new_x, new_y, collided) arrays
+        """
+        dx = np.broadcast_to(dx, mask.shape)
+        dy = np.broadcast_to(dy, mask.shape)
+        speed = np.broadcast_to(speed, mask.shape)
+        moving = mask & (speed > 0)
+        collided = np.zeros_like(mask)
+        if not moving.any():
+            return x, y, collided
+
+        new_x, new_y = x.copy(), y.copy()
+        cur_x, cur_y = x.astype(np.int64), y.astype(np.int64)
+        for i in range(int(speed[moving].max())):
+            step = moving & (i < speed)
+            next_x, next_y = cur_x + dx, cur_y + dy
+            edge = (next_x < 70) | (next_x > 730)
+            boundary = (((dy > 0) & (next_y % GRID_BLOCK_SIZE == 0)) |
+                        ((dx > 0) & (next_x % GRID_BLOCK_SIZE == 0)) |
+                        ((dx < 0) & (next_x % GRID_BLOCK_SIZE == GRID_BLOCK_SIZE - 1)))
+            hit = step & (edge | (boundary & self._block(next_x, next_y)))
+            collided |= hit
+            moving &= ~hit
+            ok = step & ~hit
+            cur_x = np.where(ok, next_x, cur_x)
+            cur_y = np.where(ok, next_y, cur_y)
+            new_x = np.where(ok, next_x, new_x)
+            new_y = np.where(ok, next_y, new_y)
+        return new_x, new_y, collided
+
+    def _gravity(self, x, y, vel_y, landed, height, mask, detect):
+        """
+        Vectorized GravityActor.update_gravity for one entity per world.
+
+        Returns:
+            (new_y, vel_y, landed) arrays
+        """
+        vel_y = np.where(mask, np.minimum(vel_y + 1, GravityActor.MAX_FALL_SPEED), vel_y)
+        detect = mask & detect
+        _, y, hit = self._move(x, y, 0, _sign(vel_y), np.abs(vel_y), detect)
+        vel_y = np.where(hit, 0, vel_y)
+        landed = landed | hit
+        y = np.where(detect & (y - height >= HEIGHT), 1, y)
+        y = np.where(mask & ~detect, y + vel_y, y)
+        return y, vel_y, landed
+
+    # ------------------------------------------------------------------
+    # Level and player lifecycle
+
+    def _reset_player(self, mask):
+        """Player.reset for the selected worlds."""
+        self.player_x[mask] = WIDTH / 2
+        self.player_y[mask] = 100
+        self.player_vel_y[mask] = 0
+        self.player_direction[mask] = 1
+        self.player_fire_timer[mask] = 0
+        self.player_hurt_timer[mask] = 100
+        self.player_health[mask] = 3
+        self.player_blowing[mask] = -1
+
+    def _next_level(self, w):
+        """Game.next_level for one world."""
+        self.level_colour[w] = (self.level_colour[w] + 1) % 4
+        self.level[w] += 1
+        level = int(self.level[w])
+        self.grid[w] = LEVEL_MASKS[level % len(LEVELS)]
+        self.timer[w] = -1
+
+        mask = self.worlds == w
+        self._reset_player(mask)
+        for entities in (self.fruits, self.bolts, self.robots, self.pops, self.orbs):
+            entities.count[w] = 0
+
+        num_enemies = 10 + level
+        num_strong_enemies = 1 + int(level / 1.5)
+        num_weak_enemies = num_enemies - num_strong_enemies
+        pending = (num_strong_enemies * [Robot.TYPE_AGGRESSIVE] +
+                   num_weak_enemies * [Robot.TYPE_NORMAL])
+        self.rngs[w].shuffle(pending)
+        self.pending_enemies[w] = pending
+
+    def _robot_spawn_x(self, w):
+        """Game.get_robot_spawn_x for one world."""
+        r = self.rngs[w].randint(0, NUM_COLUMNS - 1)
+        for i in range(NUM_COLUMNS):
+            grid_x = (r + i) % NUM_COLUMNS
+            if not LEVEL_MASKS[self.level[w] % len(LEVELS), 0, grid_x]:
+                return GRID_BLOCK_SIZE * grid_x + LEVEL_X_OFFSET + 12
+        return WIDTH / 2
+
+    # ------------------------------------------------------------------
+    # Per-entity updates, in Game.update order
+
+    def _player_bounds(self):
+        """(left, top, width, height) of each world's player."""
+        w = SPRITE_W[self.player_img]
+        h = SPRITE_H[self.player_img]
+        return self.player_x - w * 0.5, self.player_y - h, w, h
+
+    def _update_player(self, inputs):
+        everyone = np.ones(self.num_worlds, dtype=bool)
+        left, right, up = inputs[:, _LEFT], inputs[:, _RIGHT], inputs[:, _UP]
+
+        self.player_y, self.player_vel_y, self.player_landed = self._gravity(
+            self.player_x, self.player_y, self.player_vel_y, self.player_landed,
+            SPRITE_H[self.player_img], everyone, self.player_health > 0)
+
+        self.player_fire_timer -= 1
+        self.player_hurt_timer -= 1
+        self.player_hurt_timer = np.where(self.player_landed,
+                                          np.minimum(self.player_hurt_timer, 100),
+                                          self.player_hurt_timer)
+
+        hurt = self.player_hurt_timer > 100
+        control = ~hurt
+
+        # Knockback, or respawn after falling off screen
+        self.player_x, self.player_y, _ = self._move(
+            self.player_x, self.player_y, self.player_direction, 0, 4,
+            hurt & (self.player_health > 0))
+        respawn = (hurt & (self.player_health <= 0) &
+                   (self.player_y - SPRITE_H[self.player_img] >= HEIGHT * 1.5))
+        if respawn.any():
+            self.player_lives[respawn] -= 1
+            self._reset_player(respawn)
+
+        # Movement
+        dx = np.where(left, -1, np.where(right, 1, 0))
+        steer = control & (dx != 0)
+        self.player_direction = np.where(steer, dx, self.player_direction)
+        self.player_x, self.player_y, _ = self._move(
+            self.player_x, self.player_y, dx, 0, 4, steer & (self.player_fire_timer < 10))
+
+        # Firing
+        fire = (control & inputs[:, _FIRE_PRESSED] & (self.player_fire_timer <= 0) &
+                (self.orbs.count < 5))
+        if fire.any():
+            worlds = np.flatnonzero(fire)
+            x = np.minimum(730, np.maximum(70, self.player_x + self.player_direction * 38))
+            y = self.player_y - 35
+            slots = self.orbs.append(worlds, x=x[worlds], y=y[worlds],
+                                     direction=self.player_direction[worlds])
+            self.player_blowing[worlds] = slots
+            self.player_fire_timer[worlds] = 20
+
+        held = control & inputs[:, _FIRE_HELD]
+        blowing = held & (self.player_blowing >= 0)
+        if blowing.any():
+            worlds = np.flatnonzero(blowing)
+            slots = self.player_blowing[worlds]
+            self.orbs.blown_frames[worlds, slots] += 4
+            done = self.orbs.blown_frames[worlds, slots] >= 120
+            self.player_blowing[worlds[done]] = -1
+        self.player_blowing[control & ~inputs[:, _FIRE_HELD]] = -1
+
+        # Jumping
+        jump = control & up & (self.player_vel_y == 0) & self.player_landed
+        self.player_vel_y = np.where(jump, -16, self.player_vel_y)
+        self.player_landed &= ~jump
+
+        # Sprite
+        dir_index = (self.player_direction > 0).astype(np.int64)
+        hurt_timer = self.player_hurt_timer
+        visible = (hurt_timer <= 0) | (hurt_timer % 2 == 1)
+        self.player_img = np.select(
+            [~visible,
+             (hurt_timer > 100) & (self.player_health > 0),
+             hurt_timer > 100,
+             self.player_fire_timer > 0,
+             ~left & ~right],
+            [BLANK,
+             RECOIL_IMG[dir_index],
+             FALL_IMG[(self.timer // 4) % 2],
+             BLOW_IMG[dir_index],
+             STILL],
+            RUN_IMG[dir_index, (self.timer // 8) % 4])
+
+    def _hurt_player(self, mask, direction):
+        """Damage side of Player.hit_test for the selected worlds."""
+        self.player_hurt_timer[mask] = 200
+        self.player_health[mask] -= 1
+        self.player_vel_y[mask] = -12
+        self.player_landed[mask] = False
+        self.player_direction[mask] = direction[mask]
+
+    def _update_fruits(self):
+        fruits = self.fruits
+        for k in range(int(fruits.count.max())):
+            live = fruits.live(k)
+            x = fruits.x[:, k]
+            height = SPRITE_H[fruits.img[:, k]]
+            y, fruits.vel_y[:, k], fruits.landed[:, k] = self._gravity(
+                x, fruits.y[:, k], fruits.vel_y[:, k], fruits.landed[:, k], height, live, True)
+            fruits.y[:, k] = y
+
+            # Player collides with the fruit's centre
+            width = SPRITE_W[fruits.img[:, k]]
+            centre_x = x - width * 0.5 + width / 2
+            centre_y = y - height + height / 2
+            p_left, p_top, p_width, p_height = self._player_bounds()
+            collected = (live & (p_left <= centre_x) & (centre_x < p_left + p_width) &
+                         (p_top <= centre_y) & (centre_y < p_top + p_height))
+            fruit_type = fruits.type[:, k]
+            health = collected & (fruit_type == Fruit.EXTRA_HEALTH)
+            life = collected & (fruit_type == Fruit.EXTRA_LIFE)
+            score = collected & ~health & ~life
+            self.player_health[health] = np.minimum(3, self.player_health[health] + 1)
+            self.player_lives[life] += 1
+            self.player_score[score] += (fruit_type[score] + 1) * 100
+
+            ttl = fruits.time_to_live[:, k]
+            ttl = np.where(collected, 0, np.where(live, ttl - 1, ttl))
+            fruits.time_to_live[:, k] = ttl
+
+            expired = np.flatnonzero(live & (ttl <= 0))
+            self.pops.append(expired, x=x[expired], y=y[expired] - 27, type=0)
+
+            frame = (self.timer // 6) % 4
+            fruits.img[:, k] = np.where(live, FRUIT_IMG[fruit_type, frame], fruits.img[:, k])
+
+    def _update_bolts(self):
+        bolts, orbs = self.bolts, self.orbs
+        for k in range(int(bolts.count.max())):
+            live = bolts.live(k)
+            direction = bolts.direction[:, k]
+            x, y, blocked = self._move(bolts.x[:, k], bolts.y[:, k], direction, 0, Bolt.SPEED, live)
+            bolts.x[:, k], bolts.y[:, k] = x, y
+
+            # Test orbs in order, then the player
+            hit = blocked.copy()
+            for j in range(int(orbs.count.max())):
+                width = SPRITE_W[orbs.img[:, j]]
+                height = SPRITE_H[orbs.img[:, j]]
+                left = orbs.x[:, j] - width * 0.5
+                top = orbs.y[:, j] - height * 0.5
+                hit_orb = (live & ~hit & orbs.live(j) & (left <= x) & (x < left + width) &
+                           (top <= y) & (y < top + height))
+                orbs.timer[hit_orb, j] = Orb.MAX_TIMER - 1
+                hit |= hit_orb
+
+            p_left, p_top, p_width, p_height = self._player_bounds()
+            hit_player = (live & ~hit & (self.player_hurt_timer < 0) &
+                          (p_left <= x) & (x < p_left + p_width) &
+                          (p_top <= y) & (y < p_top + p_height))
+            self._hurt_player(hit_player, direction)
+            hit |= hit_player
+
+            bolts.active[:, k] &= ~(live & hit)
+            frame = (self.timer // 4) % 2
+            bolts.img[:, k] = np.where(live, BOLT_IMG[(direction > 0).astype(np.int64), frame],
+                                       bolts.img[:, k])
+
+    def _update_robots(self):
+        robots, orbs = self.robots, self.orbs
+        fire_probability = 0.001 + (0.0001 * np.minimum(100, self.level))
+        for k in range(int(robots.count.max())):
+            live = robots.live(k)
+            width = SPRITE_W[robots.img[:, k]]
+            height = SPRITE_H[robots.img[:, k]]
+            y, robots.vel_y[:, k], robots.landed[:, k] = self._gravity(
+                robots.x[:, k], robots.y[:, k], robots.vel_y[:, k], robots.landed[:, k], height, live, True)
+
+            change_dir_timer = np.where(live, robots.change_dir_timer[:, k] - 1,
+                                        robots.change_dir_timer[:, k])
+            fire_timer = np.where(live, robots.fire_timer[:, k] + 1, robots.fire_timer[:, k])
+            direction = robots.direction[:, k].copy()
+
+            x, y, blocked = self._move(robots.x[:, k], y, direction, 0, robots.speed[:, k], live)
+            change_dir_timer[blocked] = 0
+
+            # Random direction change, biased toward player
+            for w in np.flatnonzero(live & (change_dir_timer <= 0)):
+                rng = self.rngs[w]
+                towards_player = -1 if self.player_x[w] - x[w] < 0 else 1
+                direction[w] = rng.choice([-1, 1, towards_player])
+                change_dir_timer[w] = rng.randint(100, 250)
+
+            top = y - height
+            bottom = y - height + height
+
+            # Aggressive robots shoot at orbs
+            aiming = live & (robots.type[:, k] == Robot.TYPE_AGGRESSIVE) & (fire_timer >= 24)
+            for j in range(int(orbs.count.max())):
+                orb_x, orb_y = orbs.x[:, j], orbs.y[:, j]
+                target = (aiming & orbs.live(j) & (orb_y >= top) & (orb_y < bottom) &
+                          (np.abs(orb_x - x) < 200))
+                direction = np.where(target, _sign(orb_x - x), direction)
+                fire_timer[target] = 0
+                aiming &= ~target
+
+            # Fire at player
+            ready = live & (fire_timer >= 12)
+            p_left, p_top, p_width, p_height = self._player_bounds()
+            level_with_player = (top < p_top + p_height) & (bottom > p_top)
+            fire_prob = np.where(level_with_player, fire_probability * 10, fire_probability)
+            for w in np.flatnonzero(ready):
+                if self.rngs[w].random() < fire_prob[w]:
+                    fire_timer[w] = 0
+            spawn = np.flatnonzero(live & ~ready & (fire_timer == 8))
+            self.bolts.append(spawn, x=x[spawn] + direction[spawn] * 20, y=y[spawn] - 38,
+                              direction=direction[spawn])
+
+            # Check collision with orbs
+            left = x - width * 0.5
+            trapping = live.copy()
+            for j in range(int(orbs.count.max())):
+                orb_x, orb_y = orbs.x[:, j], orbs.y[:, j]
+                trapped = (trapping & orbs.live(j) & (orbs.trapped[:, j] < 0) &
+                           (left <= orb_x) & (orb_x < left + width) &
+                           (top <= orb_y) & (orb_y < top + height))
+                robots.alive[trapped, k] = False
+                orbs.floating[trapped, j] = True
+                orbs.trapped[trapped, j] = robots.type[trapped, k]
+                trapping &= ~trapped
+
+            dir_index = (direction > 0).astype(np.int64)
+            frame = np.where(fire_timer < 12, 5 + (fire_timer // 4), 1 + ((self.timer // 4) % 4))
+            robots.img[:, k] = np.where(live,
+                                        ROBOT_IMG[robots.type[:, k], dir_index, np.clip(frame, 0, 7)],
+                                        robots.img[:, k])
+            robots.x[:, k], robots.y[:, k] = x, y
+            robots.direction[:, k] = direction
+            robots.change_dir_timer[:, k] = change_dir_timer
+            robots.fire_timer[:, k] = fire_timer
+
+    def _update_pops(self):
+        pops = self.pops
+        live = np.arange(pops.capacity) < pops.count[:, None]
+        pops.timer[live] += 1
+        frame = np.clip(pops.timer // 2, 0, POP_IMG.shape[1] - 1)
+        pops.img = np.where(live, POP_IMG[pops.type, frame], pops.img)
+
+    def _update_orbs(self):
+        orbs = self.orbs
+        for k in range(int(orbs.count.max())):
+            live = orbs.live(k)
+            timer = np.where(live, orbs.timer[:, k] + 1, orbs.timer[:, k])
+            floating = orbs.floating[:, k].copy()
+            x, y = orbs.x[:, k], orbs.y[:, k]
+
+            # Float upwards at a random speed
+            rising = live & floating
+            speed = np.zeros(self.num_worlds, dtype=np.int64)
+            for w in np.flatnonzero(rising):
+                speed[w] = self.rngs[w].randint(1, 2)
+            x, y, _ = self._move(x, y, 0, -1, speed, rising)
+
+            # Or move horizontally until hitting a block
+            x, y, blocked = self._move(x, y, orbs.direction[:, k], 0, 4, live & ~floating)
+            floating |= blocked
+
+            blown = live & (timer == orbs.blown_frames[:, k])
+            floating |= blown
+            popping = live & ~blown & ((timer >= Orb.MAX_TIMER) | (y <= -40))
+            worlds = np.flatnonzero(popping)
+            self.pops.append(worlds, x=x[worlds], y=y[worlds], type=1)
+
+            trapped_type = orbs.trapped[:, k]
+            worlds = np.flatnonzero(popping & (trapped_type >= 0))
+            if worlds.size:
+                fruit_types = [self.rngs[w].choice(NORMAL_FRUIT_TYPES if trapped_type[w] == 0
+                                                   else BONUS_FRUIT_TYPES)
+                               for w in worlds]
+                self.fruits.append(worlds, x=x[worlds], y=y[worlds], type=fruit_types)
+
+            safe_timer = np.maximum(timer, 0)
+            orb_frame = np.where(safe_timer < 9, safe_timer // 3,
+                                 3 + (((safe_timer - 9) // 8) % 4))
+            image = np.where(trapped_type >= 0,
+                             TRAP_IMG[np.maximum(trapped_type, 0), (safe_timer // 4) % 8],
+                             ORB_IMG[orb_frame])
+            image = np.where(safe_timer < 9, ORB_IMG[np.minimum(orb_frame, 6)], image)
+            orbs.img[:, k] = np.where(live, image, orbs.img[:, k])
+            orbs.x[:, k], orbs.y[:, k] = x, y
+            orbs.timer[:, k] = timer
+            orbs.floating[:, k] = floating
+
+    def _remove_inactive(self):
+        self.fruits.compact(self.fruits.time_to_live > 0)
+        self.bolts.compact(self.bolts.active)
+        self.robots.compact(self.robots.alive)
+        self.pops.compact(self.pops.timer < 12)
+        remap = self.orbs.compact((self.orbs.timer < Orb.MAX_TIMER) & (self.orbs.y > -40))
+
+        # Keep the player's reference to the orb being blown
+        blowing = self.player_blowing >= 0
+        self.player_blowing[blowing] = remap[blowing, self.player_blowing[blowing]]
+
+    def _spawn(self):
+        has_enemies = (np.array([len(p) for p in self.pending_enemies]) + self.robots.count) > 0
+
+        # Spawn random fruit
+        worlds = np.flatnonzero((self.timer % 100 == 0) & has_enemies)
+        for w in worlds:
+            rng = self.rngs[w]
+            x, y = rng.randint(70, 730), rng.randint(75, 400)
+            self.fruits.append(np.array([w]), x=x, y=y, type=rng.choice(NORMAL_FRUIT_TYPES))
+
+        # Spawn enemies
+        max_enemies = np.minimum((self.level + 6) // 2, 8)
+        for w in np.flatnonzero((self.timer % 81 == 0) & (self.robots.count < max_enemies)):
+            if not self.pending_enemies[w]:
+                continue
+            robot_type = self.pending_enemies[w].pop()
+            x = self._robot_spawn_x(w)
+            speed = self.rngs[w].randint(1, 3)
+            self.robots.append(np.array([w]), x=x, y=-30, type=robot_type, speed=speed)
+
+    def _check_level_complete(self):
+        busy = self.fruits.count + self.robots.count + self.pops.count
+        slots = np.arange(self.orbs.capacity) < self.orbs.count[:, None]
+        trapped = ((self.orbs.trapped >= 0) & slots).any(axis=1)
+        for w in np.flatnonzero((busy == 0) & ~trapped):
+            if not self.pending_enemies[w]:
+                self._next_level(w)
+
+    # ------------------------------------------------------------------
+    # Public API
+
+    def update(self, inputs):
+        """
+        Advance every world by one frame.
+
+        Args:
+            inputs: (N, 7) bool array, columns in INPUT_FIELDS order
+        """
+        inputs = np.asarray(inputs, dtype=bool)
+        self.timer += 1
+        self._update_player(inputs)
+        self._update_fruits()
+        self._update_bolts()
+        self._update_robots()
+        self._update_pops()
+        self._update_orbs()
+        self._remove_inactive()
+        self._spawn()
+        self._check_level_complete()
+
+    def world_state(self, w):
+        """
+        Summarise one world in the same shape as describe_game().
+
+        Returns:
+            Tuple of game, player and per-list entity state
+        """
+        def entities(arrays, *extra):
+            n = arrays.count[w]
+            return [(float(arrays.x[w, i]), float(arrays.y[w, i]), SPRITE_NAMES[arrays.img[w, i]]) +
+                    tuple(int(getattr(arrays, name)[w, i]) for name in extra)
+                    for i in range(n)]
+
+        player = (float(self.player_x[w]), float(self.player_y[w]), SPRITE_NAMES[self.player_img[w]],
+                  int(self.player_vel_y[w]), int(self.player_score[w]), int(self.player_lives[w]),
+                  int(self.player_health[w]), int(self.player_hurt_timer[w]))
+        return (int(self.timer[w]), int(self.level[w]), player,
+                entities(self.fruits, "time_to_live"),
+                entities(self.bolts, "direction"),
+                entities(self.robots, "direction", "fire_timer"),
+                entities(self.pops, "timer"),
+                entities(self.orbs, "timer", "trapped"),
+                list(self.pending_enemies[w]))
+
+
+def describe_game(game):
+    """Summarise a scalar Game for comparison with BatchedGame.world_state()."""
+    def entities(objs, *extra):
+        return [(float(o.x), float(o.y), o.image) +
+                tuple(-1 if getattr(o, name) is None else int(getattr(o, name)) for name in extra)
+                for o in objs]
+
+    p = game.player
+    player = (float(p.x), float(p.y), p.image, int(p.vel_y), p.score, p.lives, p.health, p.hurt_timer)
+    return (game.timer, game.level, player,
+            entities(game.fruits, "time_to_live"),
+            entities(game.bolts, "direction_x"),
+            entities(game.enemies, "direction_x", "fire_timer"),
+            entities(game.pops, "timer"),
+            entities(game.orbs, "timer", "trapped_enemy_type"),
+            list(game.pending_enemies))
+
+
+def random_inputs(rng, num_frames, num_worlds):
+    """Generate a (frames, N, 7) input tensor of held keys with edge-detected fire."""
+    keys = np.zeros((num_frames, num_worlds, len(INPUT_FIELDS)), dtype=bool)
+    hold = 8
+    for start in range(0, num_frames, hold):
+        direction = rng.integers(-1, 2, num_worlds)
+        block = keys[start:start + hold]
+        block[:, :, _LEFT] = direction < 0
+        block[:, :, _RIGHT] = direction > 0
+        block[:, :, _UP] = rng.random(num_worlds) < 0.2
+        block[:, :, _JUMP] = block[:, :, _UP]
+        block[:, :, _FIRE_HELD] = rng.random(num_worlds) < 0.5
+    previous = np.concatenate([np.zeros((1, num_worlds), dtype=bool), keys[:-1, :, _FIRE_HELD]])
+    keys[:, :, _FIRE_PRESSED] = keys[:, :, _FIRE_HELD] & ~previous
+    return keys
+
+
+def main(argv=None):
+    from src.game import Game
+
+    parser = argparse.ArgumentParser(description="Run N Cavern worlds with NumPy.")
+    parser.add_argument("--worlds", type=int, default=256, help="number of worlds")
+    parser.add_argument("--frames", type=int, default=1000, help="frames to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of world 0; world w uses seed + w")
+    parser.add_argument("--verify", action="store_true",
+                        help="check every world against the scalar Game, frame by frame")
+    args = parser.parse_args(argv)
+
+    seeds = [args.seed + w for w in range(args.worlds)]
+    inputs = random_inputs(np.random.default_rng(args.seed), args.frames, args.worlds)
+    batch = BatchedGame(args.worlds, seeds)
+
+    history = []
+    start = time.perf_counter()
+    for frame in range(args.frames):
+        batch.update(inputs[frame])
+        if args.verify:
+            history.append([batch.world_state(w) for w in range(args.worlds)])
+    elapsed = time.perf_counter() - start
+    ticks = args.frames * args.worlds
+    print(f"{args.worlds} worlds x {args.frames} frames in {elapsed:.3f}s "
+          f"({ticks / elapsed:.0f} world-ticks/sec)")
+
+    if args.verify:
+        mismatches = 0
+        for w, seed in enumerate(seeds):
+            game = Game(Player(), seed=seed)
+            for frame in range(args.frames):
+                game.update(InputState(*(bool(v) for v in inputs[frame, w])), lambda *a: None)
+                if describe_game(game) != history[frame][w]:
+                    print(f"world {w} diverges at frame {frame}")
+                    print("  scalar: ", describe_game(game))
+                    print("  batched:", history[frame][w])
+                    mismatches += 1
+                    break
+        print("verify: OK" if mismatches == 0 else f"verify: {mismatches} worlds diverged")
+
+
+if __name__ == "__main__":
+    main()
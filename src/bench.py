@@ -0,0 +1,387 @@
+"""
+Benchmark suite for the simulation and rendering hot paths.
+
+Measures Game.update ticks/sec for a range of levels and entity counts,
+microbenchmarks of CollideActor.move, block(), Robot.update and
+Bolt.update, and Game.draw to an offscreen surface. Every benchmark starts
+from the same seeded state (restored with Game.snapshot() before each run),
+and results are rates, so higher is always better.
+
+Usage:
+    python -m src.bench [--out results.json] [--repeat 5] [--no-draw]
+    python -m src.bench --compare baseline.json [results.json] [--threshold 0.1]
+    python -m src.bench --verify-move
+
+With --compare and one file, the suite is run now and compared against it.
+The exit status is 1 if anything regressed by more than the threshold.
+--verify-move checks the fast CollideActor.move against the reference
+pixel-by-pixel version instead, and exits with 1 if any move differs.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from src.constants import GRID_BLOCK_SIZE, LEVEL_X_OFFSET, NUM_COLUMNS, NUM_ROWS
+from src.entities.base import MIN_X, MAX_X
+from src.entities.player import Player
+from src.entities.robot import Robot
+from src.game import Game
+from src.input import InputState
+from src.sim import null_sound
+from src.utils import block
+
+# (level index, robots, orbs, bolts) for the Game.update benchmarks
+UPDATE_SCENARIOS = [
+    (0, 0, 0, 0),
+    (0, 4, 2, 2),
+    (0, 8, 5, 6),
+    (4, 8, 5, 6),
+    (9, 8, 5, 6),
+    (0, 16, 10, 12),
+]
+
+_IDLE = InputState(False, False, False, False, False, False, False)
+
+
+def make_game(level=0, robots=0, orbs=0, bolts=0, seed=0):
+    """
+    Build a game on a level with extra entities placed at random.
+
+    Args:
+        level: Level index
+        robots: Robots to add (alternately normal and aggressive)
+        orbs: Orbs to add
+        bolts: Bolts to add
+
+    Returns:
+        Game
+    """
+    game = Game(Player(), seed=seed)
+    while game.level < level:
+        game.next_level()
+    rng = game.rng
+    for i in range(robots):
+        pos = (rng.randint(MIN_X, MAX_X), rng.randint(50, 400))
+        game.enemies.append(Robot(pos, i % 2, rng))
+    for _ in range(orbs):
+        game.orbs.spawn((rng.randint(MIN_X, MAX_X), rng.randint(50, 400)), rng.choice((-1, 1)))
+    for _ in range(bolts):
+        game.bolts.spawn((rng.randint(MIN_X, MAX_X), rng.randint(50, 400)), rng.choice((-1, 1)))
+    return game
+
+
+def _measure(run, repeat):
+    """
+    Call run() repeat times; it returns (operations, seconds) for one run.
+
+    Returns:
+        Dict with the median rate, the best rate and every run's rate
+    """
+    rates = []
+    for _ in range(repeat):
+        operations, seconds = run()
+        rates.append(operations / seconds if seconds > 0 else float("inf"))
+    return {"value": statistics.median(rates), "best": max(rates), "runs": rates}
+
+
+def bench_update(level, robots, orbs, bolts, frames, repeat):
+    """Game.update ticks/sec from a fixed starting state."""
+    game = make_game(level, robots, orbs, bolts)
+    snapshot = game.snapshot()
+
+    def run():
+        game.restore(snapshot)
+        start = time.perf_counter()
+        for _ in range(frames):
+            game.update(_IDLE, null_sound)
+        return frames, time.perf_counter() - start
+
+    return _measure(run, repeat)
+
+
+def bench_move(calls, repeat):
+    """CollideActor.move calls/sec: a robot walking back and forth on a platform."""
+    game = make_game()
+    robot = Robot((400, 100), Robot.TYPE_NORMAL, game.rng)
+    grid = game.grid
+    state = robot.get_state()
+
+    def run():
+        robot.set_state(state)
+        move = robot.move
+        start = time.perf_counter()
+        for _ in range(calls // 2):
+            move(1, 0, 3, grid)
+            move(-1, 0, 3, grid)
+        return calls // 2 * 2, time.perf_counter() - start
+
+    return _measure(run, repeat)
+
+
+def bench_block(calls, repeat):
+    """block() calls/sec over points spread across the level."""
+    grid = make_game().grid
+    points = [(LEVEL_X_OFFSET + x * 7 % (NUM_COLUMNS * GRID_BLOCK_SIZE),
+               y * 11 % (NUM_ROWS * GRID_BLOCK_SIZE))
+              for x, y in zip(range(1000), range(0, 3000, 3))]
+    loops = max(1, calls // len(points))
+
+    def run():
+        start = time.perf_counter()
+        for _ in range(loops):
+            for x, y in points:
+                block(x, y, grid)
+        return loops * len(points), time.perf_counter() - start
+
+    return _measure(run, repeat)
+
+
+def bench_robot_update(frames, repeat):
+    """Robot.update calls/sec for 8 robots and 5 orbs, without the rest of Game.update."""
+    game = make_game(robots=8, orbs=5)
+    snapshot = game.snapshot()
+
+    def run():
+        game.restore(snapshot)
+        game.orb_index.build(game.orbs)
+        robots = list(game.enemies)
+        fire_probability = game.fire_probability()
+        start = time.perf_counter()
+        for timer in range(frames):
+            for robot in robots:
+                robot.update(game.grid, game.player, game.orb_index, game.bolts, timer,
+                             fire_probability, game.rng, null_sound)
+        return frames * len(robots), time.perf_counter() - start
+
+    return _measure(run, repeat)
+
+
+def bench_bolt_update(frames, repeat):
+    """Bolt.update calls/sec for 12 bolts and 5 orbs, without the rest of Game.update."""
+    game = make_game(orbs=5, bolts=12)
+    snapshot = game.snapshot()
+
+    def run():
+        game.restore(snapshot)
+        game.orb_index.build(game.orbs)
+        bolts = list(game.bolts)
+        start = time.perf_counter()
+        for timer in range(frames):
+            for bolt in bolts:
+                bolt.update(game.grid, game.orb_index, game.player, timer)
+        return frames * len(bolts), time.perf_counter() - start
+
+    return _measure(run, repeat)
+
+
+def bench_draw(frames, repeat):
+    """Game.draw frames/sec to an offscreen surface, with the game moving between draws."""
+    from src.render import offscreen_screen
+    screen = offscreen_screen()
+    game = make_game(robots=8, orbs=5, bolts=6)
+    for _ in range(frames):
+        game.update(_IDLE, null_sound)
+    game.draw(screen)  # Build the level layer and load images outside the timing
+    snapshot = game.snapshot()
+
+    def run():
+        game.restore(snapshot)
+        elapsed = 0.0
+        for _ in range(frames):
+            game.update(_IDLE, null_sound)
+            start = time.perf_counter()
+            game.draw(screen)
+            elapsed += time.perf_counter() - start
+        return frames, elapsed
+
+    return _measure(run, repeat)
+
+
+def run_suite(repeat=5, frames=300, draw=True, log=print):
+    """
+    Run every benchmark.
+
+    Args:
+        repeat: Runs per benchmark (the median is reported)
+        frames: Frames per Game.update / draw run
+        draw: Include the Game.draw benchmark (needs pygame)
+        log: Function called with a line of progress per benchmark
+
+    Returns:
+        Dict of benchmark name -> result dict
+    """
+    benchmarks = []
+    for level, robots, orbs, bolts in UPDATE_SCENARIOS:
+        name = f"update/level{level + 1}/r{robots}_o{orbs}_b{bolts}"
+        benchmarks.append((name, "ticks/s",
+                           lambda s=(level, robots, orbs, bolts): bench_update(*s, frames, repeat)))
+    benchmarks += [
+        ("micro/move", "calls/s", lambda: bench_move(20000, repeat)),
+        ("micro/block", "calls/s", lambda: bench_block(100000, repeat)),
+        ("micro/robot_update", "calls/s", lambda: bench_robot_update(frames, repeat)),
+        ("micro/bolt_update", "calls/s", lambda: bench_bolt_update(frames, repeat)),
+    ]
+    if draw:
+        benchmarks.append(("draw/offscreen", "frames/s", lambda: bench_draw(frames, repeat)))
+
+    results = {}
+    for name, unit, bench in benchmarks:
+        result = bench()
+        result["unit"] = unit
+        results[name] = result
+        log(f"{name:40} {result['value']:>12.0f} {unit}")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compare two result sets.
+
+    Args:
+        baseline: Results dict (as saved by main) to compare against
+        current: Newer results dict
+        threshold: Fractional slowdown counted as a regression
+
+    Returns:
+        List of (name, baseline value, current value, change, regressed)
+        for benchmarks present in both
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        change = result["value"] / base["value"] - 1 if base["value"] else 0.0
+        rows.append((name, base["value"], result["value"], change, change < -threshold))
+    return rows
+
+
+# Speeds checked by verify_move: short moves, either side of a whole tile
+# and several tiles
+VERIFY_SPEEDS = (0, 1, 2, 3, 4, 6, GRID_BLOCK_SIZE - 1, GRID_BLOCK_SIZE, GRID_BLOCK_SIZE + 1,
+                 2 * GRID_BLOCK_SIZE + 3, 60)
+
+
+def verify_move(levels=None, stride=7, log=print):
+    """
+    Check CollideActor.move against the pixel-by-pixel _move_stepped.
+
+    Every level is swept in all nine directions (including none) at each
+    speed in VERIFY_SPEEDS, from positions every stride pixels across and
+    beyond the playfield, plus every pixel around the MIN_X/MAX_X edges and
+    a half-pixel offset (entities can sit at fractional positions). The
+    stride should be coprime with GRID_BLOCK_SIZE, so positions fall at
+    every offset within a tile.
+
+    Args:
+        levels: Level indices to check (default: all)
+        stride: Pixels between swept positions
+        log: Function to report mismatches with
+
+    Returns:
+        Tuple of (moves checked, mismatches)
+    """
+    from src.entities.base import CollideActor
+    from src.level import COMPILED_LEVELS
+
+    xs = set(range(MIN_X - 2 * GRID_BLOCK_SIZE, MAX_X + 2 * GRID_BLOCK_SIZE + 1, stride))
+    for edge in (MIN_X, MAX_X):
+        xs.update(range(edge - 2, edge + 3))
+    ys = range(-2 * GRID_BLOCK_SIZE, NUM_ROWS * GRID_BLOCK_SIZE + 2 * GRID_BLOCK_SIZE, stride)
+    positions = [(x, y) for x in sorted(xs) for y in ys]
+    positions += [(x + 0.5, y + 0.5) for x, y in positions[::7]]
+    directions = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+    fast = CollideActor((0, 0))
+    stepped = CollideActor((0, 0))
+    checked = mismatches = 0
+    for level in range(len(COMPILED_LEVELS)) if levels is None else levels:
+        grid = COMPILED_LEVELS[level]
+        for pos in positions:
+            for dx, dy in directions:
+                for speed in VERIFY_SPEEDS:
+                    fast.pos = stepped.pos = pos
+                    result = fast.move(dx, dy, speed, grid)
+                    expected = stepped._move_stepped(dx, dy, speed, grid)
+                    checked += 1
+                    # Types too: a move that goes nowhere must not truncate a float position
+                    if (result, fast.x, fast.y) != (expected, stepped.x, stepped.y) or \
+                            (type(fast.x), type(fast.y)) != (type(stepped.x), type(stepped.y)):
+                        mismatches += 1
+                        if mismatches <= 10:
+                            log(f"level {level} from {pos} moving ({dx}, {dy}) at {speed}: "
+                                f"move -> {result} {fast.pos}, stepped -> {expected} {stepped.pos}")
+    return checked, mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Game.update, Game.draw and hot paths.")
+    parser.add_argument("--out", metavar="PATH", help="save results as JSON")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="frames per update/draw run")
+    parser.add_argument("--no-draw", action="store_true", help="skip the offscreen draw benchmark")
+    parser.add_argument("--compare", nargs="+", metavar="JSON",
+                        help="baseline results, and optionally results to compare (default: run now)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown fraction flagged as a regression (default 0.1)")
+    parser.add_argument("--verify-move", action="store_true",
+                        help="check CollideActor.move against the pixel-by-pixel version and exit")
+    args = parser.parse_args(argv)
+
+    if args.verify_move:
+        start = time.perf_counter()
+        checked, mismatches = verify_move()
+        print(f"{checked} moves checked in {time.perf_counter() - start:.1f}s")
+        print("verify: OK" if mismatches == 0 else f"verify: {mismatches} moves differ")
+        sys.exit(1 if mismatches else 0)
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline and at most one other results file")
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        current = {
+            "meta": {
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "repeat": args.repeat,
+                "frames": args.frames,
+            },
+            "results": run_suite(args.repeat, args.frames, not args.no_draw),
+        }
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        print(f"\n{baseline['meta'].get('commit')} -> {current['meta'].get('commit')}")
+        regressions = 0
+        for name, before, after, change, regressed in compare(baseline, current, args.threshold):
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:40} {before:>12.0f} {after:>12.0f} {change:>+8.1%}{flag}")
+            regressions += regressed
+        if regressions:
+            print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,44 @@ WIDTH = 800
 HEIGHT = 480
 TITLE = "Cavern"
 
+# Redraw and push only changed screen regions instead of the whole screen
+DIRTY_RECT_RENDERING = False
+
+# File to record player input to, for replaying with src.replay (None to disable)
+INPUT_RECORDING_PATH = None
+
+# Load every image and sound on a background thread behind a loading screen,
+# instead of the first time each is used during play
+PRELOAD_ASSETS = True
+
+# File to write the preload timings to as JSON (None to only print a summary)
+STARTUP_REPORT_PATH = None
+
+# Most memory for decoded sound effects, in bytes; the least recently played
+# are unloaded to stay within it (blow, pop and laser are always kept). None
+# keeps every effect once loaded. All effects together take about 4 MB.
+SOUND_CACHE_BYTES = None
+
+# Run the game at a fixed number of ticks per second, however fast frames are
+# drawn: slow frames are caught up by running several ticks (at most
+# MAX_TICKS_PER_FRAME), and frames with no tick due aren't redrawn. With this
+# off, the game ticks once per frame.
+FIXED_TIMESTEP = True
+TICK_RATE = 60
+MAX_TICKS_PER_FRAME = 5
+
+# With FIXED_TIMESTEP, draw moving entities between their last two tick
+# positions, for smooth motion when frames are drawn faster than TICK_RATE
+RENDER_INTERPOLATION = False
+
+# Time every frame and each part of the game update; F3 toggles an overlay
+# of the timings during play
+PROFILING = False
+
+# File to write per-frame timings to when profiling, as CSV if the name ends
+# in .csv, otherwise JSON Lines (None for no trace)
+PROFILE_TRACE_PATH = None
+
 # Grid settings
 NUM_ROWS = 18
 NUM_COLUMNS = 28
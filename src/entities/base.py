@@ -1,12 +1,129 @@
 """Base actor classes for Cavern game."""
-from pgzero.actor import Actor
+from operator import attrgetter
+
 from src.constants import ANCHOR_CENTRE, ANCHOR_CENTRE_BOTTOM, HEIGHT, GRID_BLOCK_SIZE
+from src.sprites import sprite_size
 from src.utils import block, sign
 
+# Horizontal limits of movement within the level
+MIN_X = 70
+MAX_X = 730
+
+# Fraction of the sprite size at which each named anchor sits
+_ANCHOR_X = {"left": 0, "center": 0.5, "right": 1}
+_ANCHOR_Y = {"top": 0, "center": 0.5, "bottom": 1}
+
 
-class CollideActor(Actor):
+class SimActor:
+    """
+    Pure-Python replacement for pgzero's Actor.
+    
+    Holds position, anchor, hitbox and sprite *name* only, so the simulation
+    runs without pygame. Rendering is a single blit by name in draw().
+    """
+    
+    __slots__ = ("x", "y", "width", "height", "_image", "_anchor_frac", "_anchor_x", "_anchor_y")
+    
+    # Slots left out of get_state(), e.g. references to other entities
+    UNSAVED_SLOTS = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every slot of the class and its bases, in a fixed order
+        names = [name for klass in reversed(cls.__mro__)
+                 for name in klass.__dict__.get("__slots__", ())
+                 if name not in cls.UNSAVED_SLOTS]
+        cls.STATE_SLOTS = tuple(names)
+        # C-level getter for the values of STATE_SLOTS as one flat tuple
+        cls.STATE_GETTER = attrgetter(*names)
+    
+    def __init__(self, image, pos, anchor=ANCHOR_CENTRE):
+        self._anchor_frac = (_ANCHOR_X[anchor[0]], _ANCHOR_Y[anchor[1]])
+        self.x, self.y = pos
+        self._image = None
+        self.image = image
+    
+    @property
+    def image(self):
+        return self._image
+    
+    @image.setter
+    def image(self, name):
+        if name == self._image:
+            # Same frame as before - nothing to look up
+            return
+        # Like Actor, changing the image keeps the anchor point where it is
+        self._image = name
+        self.width, self.height = sprite_size(name)
+        self._anchor_x = self.width * self._anchor_frac[0]
+        self._anchor_y = self.height * self._anchor_frac[1]
+    
+    @property
+    def pos(self):
+        return self.x, self.y
+    
+    @pos.setter
+    def pos(self, pos):
+        self.x, self.y = pos
+    
+    @property
+    def left(self):
+        return self.x - self._anchor_x
+    
+    @property
+    def right(self):
+        return self.x - self._anchor_x + self.width
+    
+    @property
+    def top(self):
+        return self.y - self._anchor_y
+    
+    @property
+    def bottom(self):
+        return self.y - self._anchor_y + self.height
+    
+    @property
+    def topleft(self):
+        return self.x - self._anchor_x, self.y - self._anchor_y
+    
+    @property
+    def center(self):
+        return (self.x - self._anchor_x + self.width / 2,
+                self.y - self._anchor_y + self.height / 2)
+    
+    def get_state(self):
+        """Return the simulation state as a flat tuple of STATE_SLOTS values."""
+        return self.STATE_GETTER(self)
+    
+    def set_state(self, state):
+        """Restore values captured with get_state()."""
+        for name, value in zip(self.STATE_SLOTS, state):
+            setattr(self, name, value)
+    
+    @classmethod
+    def from_state(cls, state):
+        """Create an entity from values captured with get_state()."""
+        entity = cls.__new__(cls)
+        entity.set_state(state)
+        return entity
+    
+    def collidepoint(self, point):
+        """Check if a point lies within the sprite's rectangle."""
+        px, py = point
+        left = self.x - self._anchor_x
+        top = self.y - self._anchor_y
+        return left <= px < left + self.width and top <= py < top + self.height
+    
+    def draw(self, screen):
+        """Render adapter: blit the current sprite by name."""
+        screen.blit(self._image, self.topleft)
+
+
+class CollideActor(SimActor):
     """Actor with collision detection against level blocks."""
     
+    __slots__ = ()
+    
     def __init__(self, pos, anchor=ANCHOR_CENTRE):
         super().__init__("blank", pos, anchor)
     
@@ -14,16 +131,62 @@ class CollideActor(Actor):
         """
         Move actor with collision detection.
         
+        Equivalent to moving 1 pixel at a time (see _move_stepped), but only
+        the tile boundaries crossed are tested and position is assigned once.
+        
         Returns:
             True if collided with block or edge, False otherwise
         """
+        if dx != 0 and dy != 0:
+            return self._move_stepped(dx, dy, speed, grid)
+        
+        x, y = int(self.x), int(self.y)
+        
+        # Find the first step (1-based) that would collide; speed + 1 if none
+        if dx > 0:
+            blocked_step = 1 if x + 1 < MIN_X else max(1, MAX_X + 1 - x)
+            limit = min(speed, blocked_step - 1)
+            boundary = x - x % GRID_BLOCK_SIZE + GRID_BLOCK_SIZE
+            while boundary - x <= limit:
+                if block(boundary, y, grid):
+                    blocked_step = boundary - x
+                    break
+                boundary += GRID_BLOCK_SIZE
+        elif dx < 0:
+            blocked_step = 1 if x - 1 > MAX_X else max(1, x - (MIN_X - 1))
+            limit = min(speed, blocked_step - 1)
+            boundary = x - 1 - x % GRID_BLOCK_SIZE
+            while x - boundary <= limit:
+                if block(boundary, y, grid):
+                    blocked_step = x - boundary
+                    break
+                boundary -= GRID_BLOCK_SIZE
+        elif x < MIN_X or x > MAX_X:
+            blocked_step = 1
+        else:
+            blocked_step = speed + 1
+            if dy > 0:
+                boundary = y - y % GRID_BLOCK_SIZE + GRID_BLOCK_SIZE
+                while boundary - y <= speed:
+                    if block(x, boundary, grid):
+                        blocked_step = boundary - y
+                        break
+                    boundary += GRID_BLOCK_SIZE
+        
+        steps = min(speed, blocked_step - 1)
+        if steps > 0:
+            self.pos = x + dx * steps, y + dy * steps
+        return blocked_step <= speed
+    
+    def _move_stepped(self, dx, dy, speed, grid):
+        """Reference 1-pixel-per-step version of move(), used for diagonal moves."""
         new_x, new_y = int(self.x), int(self.y)
         
         # Movement is done 1 pixel at a time to avoid embedding into walls
         for i in range(speed):
             new_x, new_y = new_x + dx, new_y + dy
             
-            if new_x < 70 or new_x > 730:
+            if new_x < MIN_X or new_x > MAX_X:
                 # Collided with edge of level
                 return True
             
@@ -44,6 +207,8 @@ class CollideActor(Actor):
 class GravityActor(CollideActor):
     """Actor affected by gravity."""
     
+    __slots__ = ("vel_y", "landed")
+    
     MAX_FALL_SPEED = 10
     
     def __init__(self, pos):
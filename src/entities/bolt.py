@@ -8,25 +8,35 @@ class Bolt(CollideActor):
     
     SPEED = 7
     
+    # Sprite names indexed by [direction index][animation frame]
+    IMAGES = [["bolt%d%d" % (d, f) for f in range(2)] for d in range(2)]
+    
+    __slots__ = ("direction_x", "active")
+    
     def __init__(self, pos, dir_x):
         super().__init__(pos, ANCHOR_CENTRE)
+        self.reset(pos, dir_x)
+    
+    def reset(self, pos, dir_x):
+        """Reinitialise bolt state (also used when recycling from a pool)."""
+        self.image = "blank"
+        self.pos = pos
         self.direction_x = dir_x
         self.active = True
     
-    def update(self, grid, orbs, player, game_timer):
+    def update(self, grid, orb_index, player, game_timer):
         """Update bolt position and check collisions."""
         # Move horizontally and check for block collision
         if self.move(self.direction_x, 0, Bolt.SPEED, grid):
             self.active = False
         else:
-            # Check collision with orbs and player
-            targets = orbs + ([player] if player else [])
-            for obj in targets:
-                if obj and obj.hit_test(self):
-                    self.active = False
-                    break
+            # Check collision with the first orb hit, otherwise the player
+            orbs_hit = orb_index.orbs_at(self.pos)
+            if orbs_hit:
+                orbs_hit[0].hit_test(self)
+                self.active = False
+            elif player and player.hit_test(self):
+                self.active = False
         
         # Update sprite
-        direction_idx = "1" if self.direction_x > 0 else "0"
-        anim_frame = str((game_timer // 4) % 2)
-        self.image = "bolt" + direction_idx + anim_frame
+        self.image = Bolt.IMAGES[self.direction_x > 0][(game_timer // 4) % 2]
@@ -1,16 +1,27 @@
 """Visual effects entities for Cavern game."""
-from pgzero.actor import Actor
+from src.entities.base import SimActor
 
 
-class Pop(Actor):
+class Pop(SimActor):
     """Pop animation effect."""
     
+    # Sprite names indexed by [type][animation frame]
+    IMAGES = [["pop%d%d" % (t, f) for f in range(7)] for t in range(2)]
+    
+    __slots__ = ("type", "timer")
+    
     def __init__(self, pos, pop_type):
         super().__init__("blank", pos)
+        self.reset(pos, pop_type)
+    
+    def reset(self, pos, pop_type):
+        """Reinitialise pop state (also used when recycling from a pool)."""
+        self.image = "blank"
+        self.pos = pos
         self.type = pop_type
         self.timer = -1
     
     def update(self):
         """Update animation frame."""
         self.timer += 1
-        self.image = "pop" + str(self.type) + str(self.timer // 2)
+        self.image = Pop.IMAGES[self.type][self.timer // 2]
@@ -1,5 +1,4 @@
 """Fruit pickup entity for Cavern game."""
-from random import choice
 from src.entities.base import GravityActor
 
 
@@ -12,17 +11,30 @@ class Fruit(GravityActor):
     EXTRA_HEALTH = 3
     EXTRA_LIFE = 4
     
-    def __init__(self, pos, trapped_enemy_type=0):
+    # Sprite names indexed by [type][animation phase]; frames run 0, 1, 2, 1
+    IMAGES = [["fruit%d%d" % (t, f) for f in (0, 1, 2, 1)] for t in range(5)]
+    
+    __slots__ = ("type", "time_to_live")
+    
+    def __init__(self, pos, rng, trapped_enemy_type=0):
         super().__init__(pos)
+        self.reset(pos, rng, trapped_enemy_type)
+    
+    def reset(self, pos, rng, trapped_enemy_type=0):
+        """Reinitialise fruit state (also used when recycling from a pool)."""
+        self.image = "blank"
+        self.pos = pos
+        self.vel_y = 0
+        self.landed = False
         
         # Choose fruit type based on enemy type
         if trapped_enemy_type == 0:  # Normal enemy
-            self.type = choice([Fruit.APPLE, Fruit.RASPBERRY, Fruit.LEMON])
+            self.type = rng.choice([Fruit.APPLE, Fruit.RASPBERRY, Fruit.LEMON])
         else:  # Aggressive enemy - chance for powerups
             types = 10 * [Fruit.APPLE, Fruit.RASPBERRY, Fruit.LEMON]
             types += 9 * [Fruit.EXTRA_HEALTH]
             types += [Fruit.EXTRA_LIFE]
-            self.type = choice(types)
+            self.type = rng.choice(types)
         
         self.time_to_live = 500
     
@@ -48,9 +60,7 @@ class Fruit(GravityActor):
         
         if self.time_to_live <= 0:
             # Create pop animation
-            from src.entities.effects import Pop
-            pops.append(Pop((self.x, self.y - 27), 0))
+            pops.spawn((self.x, self.y - 27), 0)
         
         # Update sprite
-        anim_frame = str([0, 1, 2, 1][(game_timer // 6) % 4])
-        self.image = "fruit" + str(self.type) + anim_frame
+        self.image = Fruit.IMAGES[self.type][(game_timer // 6) % 4]
@@ -1,5 +1,4 @@
 """Orb entity for Cavern game."""
-from random import randint
 from src.entities.base import CollideActor
 from src.constants import ANCHOR_CENTRE
 
@@ -9,8 +8,21 @@ class Orb(CollideActor):
     
     MAX_TIMER = 250
     
+    # Sprite names: growing, then floating, or holding an enemy [type][frame]
+    GROW_IMAGES = ["orb%d" % f for f in range(3)]
+    FLOAT_IMAGES = ["orb%d" % f for f in range(3, 7)]
+    TRAP_IMAGES = [["trap%d%d" % (t, f) for f in range(8)] for t in range(2)]
+    
+    __slots__ = ("direction_x", "floating", "trapped_enemy_type", "timer", "blown_frames")
+    
     def __init__(self, pos, dir_x):
         super().__init__(pos, ANCHOR_CENTRE)
+        self.reset(pos, dir_x)
+    
+    def reset(self, pos, dir_x):
+        """Reinitialise orb state (also used when recycling from a pool)."""
+        self.image = "blank"
+        self.pos = pos
         self.direction_x = dir_x
         self.floating = False
         self.trapped_enemy_type = None
@@ -24,13 +36,13 @@ class Orb(CollideActor):
             self.timer = Orb.MAX_TIMER - 1
         return collided
     
-    def update(self, grid, pops, fruits, play_sound_callback):
+    def update(self, grid, pops, fruits, rng, play_sound_callback):
         """Update orb state."""
         self.timer += 1
         
         if self.floating:
             # Float upwards
-            self.move(0, -1, randint(1, 2), grid)
+            self.move(0, -1, rng.randint(1, 2), grid)
         else:
             # Move horizontally
             if self.move(self.direction_x, 0, 4, grid):
@@ -41,22 +53,19 @@ class Orb(CollideActor):
             self.floating = True
         elif self.timer >= Orb.MAX_TIMER or self.y <= -40:
             # Pop if lifetime expired or off screen
-            from src.entities.effects import Pop
-            from src.entities.fruit import Fruit
-            
-            pops.append(Pop(self.pos, 1))
+            pops.spawn(self.pos, 1)
             if self.trapped_enemy_type is not None:
-                fruits.append(Fruit(self.pos, self.trapped_enemy_type))
+                fruits.spawn(self.pos, rng, self.trapped_enemy_type)
             play_sound_callback("pop", 4)
         
         # Update sprite
         if self.timer < 9:
             # Growing animation
-            self.image = "orb" + str(self.timer // 3)
+            self.image = Orb.GROW_IMAGES[self.timer // 3]
         else:
             if self.trapped_enemy_type is not None:
                 # Trapped enemy animation
-                self.image = "trap" + str(self.trapped_enemy_type) + str((self.timer // 4) % 8)
+                self.image = Orb.TRAP_IMAGES[self.trapped_enemy_type][(self.timer // 4) % 8]
             else:
                 # Normal orb animation
-                self.image = "orb" + str(3 + (((self.timer - 9) // 8) % 4))
+                self.image = Orb.FLOAT_IMAGES[((self.timer - 9) // 8) % 4]
@@ -6,6 +6,17 @@ from src.constants import WIDTH, HEIGHT
 class Player(GravityActor):
     """Player character."""
     
+    # Sprite names indexed by [direction index] (and [animation frame])
+    RECOIL_IMAGES = ["recoil0", "recoil1"]
+    BLOW_IMAGES = ["blow0", "blow1"]
+    RUN_IMAGES = [["run%d%d" % (d, f) for f in range(4)] for d in range(2)]
+    FALL_IMAGES = ["fall0", "fall1"]
+    
+    __slots__ = ("lives", "score", "direction_x", "fire_timer", "hurt_timer", "health", "blowing_orb")
+    
+    # Saved by Game.snapshot() as an index into the orb list instead
+    UNSAVED_SLOTS = ("blowing_orb",)
+    
     def __init__(self):
         super().__init__((0, 0))
         self.lives = 2
@@ -94,15 +105,11 @@ class Player(GravityActor):
     
     def _handle_firing(self, input_state, orbs, play_sound_callback):
         """Handle orb creation and blowing."""
-        from src.entities.orb import Orb
-        
         # Create new orb if conditions are met
         if input_state.fire_pressed and self.fire_timer <= 0 and len(orbs) < 5:
             x = min(730, max(70, self.x + self.direction_x * 38))
             y = self.y - 35
-            new_orb = Orb((x, y), self.direction_x)
-            orbs.append(new_orb)
-            self.blowing_orb = new_orb
+            self.blowing_orb = orbs.spawn((x, y), self.direction_x)
             play_sound_callback("blow", 4)
             self.fire_timer = 20
         
@@ -124,24 +131,26 @@ class Player(GravityActor):
     
     def _update_sprite(self, input_state, game_timer):
         """Update sprite based on current state."""
-        self.image = "blank"
+        image = "blank"
         
         # Flash when hurt
         if self.hurt_timer <= 0 or self.hurt_timer % 2 == 1:
-            dir_index = "1" if self.direction_x > 0 else "0"
+            dir_index = self.direction_x > 0
             
             if self.hurt_timer > 100:
                 # Hurt animation
                 if self.health > 0:
-                    self.image = "recoil" + dir_index
+                    image = Player.RECOIL_IMAGES[dir_index]
                 else:
-                    self.image = "fall" + str((game_timer // 4) % 2)
+                    image = Player.FALL_IMAGES[(game_timer // 4) % 2]
             elif self.fire_timer > 0:
                 # Blowing animation
-                self.image = "blow" + dir_index
+                image = Player.BLOW_IMAGES[dir_index]
             elif not input_state.left and not input_state.right:
                 # Standing still
-                self.image = "still"
+                image = "still"
             else:
                 # Running animation
-                self.image = "run" + dir_index + str((game_timer // 8) % 4)
+                image = Player.RUN_IMAGES[dir_index][(game_timer // 8) % 4]
+        
+        self.image = image
@@ -0,0 +1,106 @@
+"""Entity storage for Cavern game."""
+
+
+class EntityList(list):
+    """
+    List of live entities that is compacted in place.
+    
+    Order is preserved on removal because it decides update order, and
+    therefore which orb a robot traps first and the order of random draws.
+    
+    If an entity class is given, removed entities are kept on a free list and
+    recycled by spawn() through the class's reset() method.
+    """
+    
+    __slots__ = ("factory", "free", "hits", "misses")
+    
+    def __init__(self, factory=None):
+        """
+        Args:
+            factory: Entity class to pool, or None for a plain list
+        """
+        super().__init__()
+        self.factory = factory
+        self.free = []
+        self.hits = 0    # spawn() calls served from the free list
+        self.misses = 0  # spawn() calls that had to construct a new entity
+    
+    def spawn(self, *args):
+        """
+        Add a new entity, recycling a removed one if possible.
+        
+        Args:
+            args: Constructor arguments, also accepted by the entity's reset()
+            
+        Returns:
+            The new entity
+        """
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            self.hits += 1
+        else:
+            entity = self.factory(*args)
+            self.misses += 1
+        self.append(entity)
+        return entity
+    
+    def clear(self):
+        """Remove all entities."""
+        if self.factory is not None:
+            self.free.extend(self)
+        super().clear()
+    
+    def restore(self, cls, states):
+        """
+        Replace the contents with entities set to previously captured states.
+        
+        Current entities are overwritten in place, then free ones are reused,
+        so restoring doesn't allocate once the list has been that long.
+        
+        Args:
+            cls: Entity class
+            states: Sequence of get_state() tuples of cls entities
+        """
+        live = len(self)
+        for i, state in enumerate(states):
+            if i < live:
+                self[i].set_state(state)
+            elif self.free:
+                entity = self.free.pop()
+                entity.set_state(state)
+                self.append(entity)
+            else:
+                self.append(cls.from_state(state))
+        
+        if len(states) < live:
+            if self.factory is not None:
+                self.free.extend(self[len(states):])
+            del self[len(states):]
+    
+    def remove_dead(self, is_alive, on_remove=None):
+        """
+        Remove entities for which is_alive(entity) is false, without allocating.
+        
+        Args:
+            is_alive: Predicate called for each entity
+            on_remove: Optional callback for each removed entity
+            
+        Returns:
+            Number of entities removed
+        """
+        write = 0
+        for entity in self:
+            if is_alive(entity):
+                self[write] = entity
+                write += 1
+            else:
+                if on_remove is not None:
+                    on_remove(entity)
+                if self.factory is not None:
+                    self.free.append(entity)
+        
+        removed = len(self) - write
+        if removed:
+            del self[write:]
+        return removed
@@ -1,5 +1,4 @@
 """Robot enemy entity for Cavern game."""
-from random import randint, choice, random
 from src.entities.base import GravityActor
 from src.utils import sign
 
@@ -10,16 +9,22 @@ class Robot(GravityActor):
     TYPE_NORMAL = 0
     TYPE_AGGRESSIVE = 1
     
-    def __init__(self, pos, robot_type):
+    # Sprite names indexed by [type][direction index][animation frame]
+    IMAGES = [[["robot%d%d%d" % (t, d, f) for f in range(8)] for d in range(2)] for t in range(2)]
+    
+    __slots__ = ("type", "speed", "direction_x", "alive", "change_dir_timer", "fire_timer")
+    
+    def __init__(self, pos, robot_type, rng):
         super().__init__(pos)
         self.type = robot_type
-        self.speed = randint(1, 3)
+        self.speed = rng.randint(1, 3)
         self.direction_x = 1
         self.alive = True
         self.change_dir_timer = 0
         self.fire_timer = 100
     
-    def update(self, grid, player, orbs, bolts, game_timer, fire_probability, play_sound_callback):
+    def update(self, grid, player, orb_index, bolts, game_timer, fire_probability, rng,
+               play_sound_callback):
         """Update robot state."""
         self.update_gravity(grid)
         
@@ -35,12 +40,12 @@ class Robot(GravityActor):
             directions = [-1, 1]
             if player:
                 directions.append(sign(player.x - self.x))
-            self.direction_x = choice(directions)
-            self.change_dir_timer = randint(100, 250)
+            self.direction_x = rng.choice(directions)
+            self.change_dir_timer = rng.randint(100, 250)
         
         # Aggressive robots shoot at orbs
         if self.type == Robot.TYPE_AGGRESSIVE and self.fire_timer >= 24:
-            for orb in orbs:
+            for orb in orb_index.orbs_near(self.x - 200, self.top, self.x + 200, self.bottom):
                 if orb.y >= self.top and orb.y < self.bottom and abs(orb.x - self.x) < 200:
                     self.direction_x = sign(orb.x - self.x)
                     self.fire_timer = 0
@@ -52,17 +57,15 @@ class Robot(GravityActor):
             if player and self.top < player.bottom and self.bottom > player.top:
                 fire_prob *= 10
             
-            if random() < fire_prob:
+            if rng.random() < fire_prob:
                 self.fire_timer = 0
                 play_sound_callback("laser", 4)
         elif self.fire_timer == 8:
             # Create bolt
-            from src.entities.bolt import Bolt
-            bolt = Bolt((self.x + self.direction_x * 20, self.y - 38), self.direction_x)
-            bolts.append(bolt)
+            bolts.spawn((self.x + self.direction_x * 20, self.y - 38), self.direction_x)
         
         # Check collision with orbs
-        for orb in orbs:
+        for orb in orb_index.orbs_near(self.left, self.top, self.right, self.bottom):
             if orb.trapped_enemy_type is None and self.collidepoint(orb.center):
                 self.alive = False
                 orb.floating = True
@@ -71,10 +74,8 @@ class Robot(GravityActor):
                 break
         
         # Update sprite
-        direction_idx = "1" if self.direction_x > 0 else "0"
-        image = "robot" + str(self.type) + direction_idx
         if self.fire_timer < 12:
-            image += str(5 + (self.fire_timer // 4))
+            frame = 5 + (self.fire_timer // 4)
         else:
-            image += str(1 + ((game_timer // 4) % 4))
-        self.image = image
+            frame = 1 + ((game_timer // 4) % 4)
+        self.image = Robot.IMAGES[self.type][self.direction_x > 0][frame]
@@ -0,0 +1,229 @@
+"""
+Gym-style environment around the headless Game.
+
+CavernEnv.step() takes a discrete action (an index into ACTIONS) or an
+InputState, plays it for frame_skip frames and returns
+(observation, reward, done, info). Rewards come from changes in the
+player's score, health and lives. VectorEnv steps several environments
+together and resets them as they finish.
+
+For observations as NumPy planes, pass the encode method of a
+src.observation.ObservationEncoder as observe (or make_observe to VectorEnv,
+so that each environment has its own).
+
+Every InputState an action can produce is built up front, so a step costs
+little more than the Game.update calls it makes.
+"""
+from itertools import product
+
+from src.entities.player import Player
+from src.game import Game
+from src.input import InputState
+from src.rng import derive_seed
+from src.sim import null_sound
+
+# Discrete actions as (move, jump, fire): move is -1 (left), 0 or 1 (right),
+# and fire holds the fire button, so holding it keeps blowing the orb
+ACTIONS = tuple(product((0, -1, 1), (False, True), (False, True)))
+
+
+def _build_action_states():
+    """InputStates indexed by [action][whether fire was held the frame before]."""
+    states = []
+    for move, jump, fire in ACTIONS:
+        states.append(tuple(
+            InputState(left=move < 0, right=move > 0, up=jump, jump_pressed=jump,
+                       fire_pressed=fire and not fire_was_held, fire_held=fire,
+                       pause_pressed=False)
+            for fire_was_held in (False, True)))
+    return tuple(states)
+
+
+_ACTION_STATES = _build_action_states()
+
+
+def player_features(game):
+    """
+    Default observation: a small tuple describing the player and level.
+
+    Returns:
+        (x, y, vel_y, direction_x, health, lives, level, enemies, orbs, fruits)
+    """
+    player = game.player
+    return (player.x, player.y, player.vel_y, player.direction_x, player.health, player.lives,
+            game.level, len(game.enemies) + len(game.pending_enemies), len(game.orbs),
+            len(game.fruits))
+
+
+class CavernEnv:
+    """Single game environment with reset(seed) / step(action)."""
+
+    def __init__(self, frame_skip=4, max_frames=None, observe=player_features,
+                 score_weight=0.01, health_weight=1.0, life_weight=5.0):
+        """
+        Args:
+            frame_skip: Frames each action is repeated for
+            max_frames: End episodes after this many frames (None for no limit)
+            observe: Function of the Game returning the observation
+            score_weight: Reward per point scored
+            health_weight: Reward per point of health gained (lost health
+                gives the negative), except in steps where the level changes
+                or a life is lost, as both refill health
+            life_weight: Reward per life gained (lost lives give the negative)
+        """
+        self.frame_skip = frame_skip
+        self.max_frames = max_frames
+        self.observe = observe
+        self.score_weight = score_weight
+        self.health_weight = health_weight
+        self.life_weight = life_weight
+
+        self.game = None
+        self.frames = 0
+        self.episodes = 0
+        self._seed = None
+        self._fire_held = False
+
+    @property
+    def num_actions(self):
+        return len(ACTIONS)
+
+    def reset(self, seed=None):
+        """
+        Start a new episode.
+
+        Args:
+            seed: Seed for this and later episodes; None continues from the
+                previous seed (later episodes use derived sub-streams)
+
+        Returns:
+            First observation
+        """
+        if seed is not None:
+            self._seed = seed
+            self.episodes = 0
+        game_seed = self._seed if self.episodes == 0 else derive_seed(self._seed, "episode", self.episodes)
+        self.episodes += 1
+
+        self.game = Game(Player(), seed=game_seed)
+        self.frames = 0
+        self._fire_held = False
+        return self.observe(self.game)
+
+    def step(self, action):
+        """
+        Play an action for frame_skip frames.
+
+        Args:
+            action: Index into ACTIONS, or an InputState to use as is
+
+        Returns:
+            Tuple of (observation, reward, done, info). info has the score,
+            level, lives and health, and "truncated" if max_frames ended
+            the episode.
+        """
+        game = self.game
+        player = game.player
+        score, lives, health = player.score, player.lives, player.health
+        level = game.level
+
+        if isinstance(action, InputState):
+            first = repeat = action
+        else:
+            states = _ACTION_STATES[action]
+            first = states[self._fire_held]
+            fire = ACTIONS[action][2]
+            repeat = states[fire]
+            self._fire_held = fire
+
+        input_state = first
+        for _ in range(self.frame_skip):
+            game.update(input_state, null_sound)
+            input_state = repeat
+            self.frames += 1
+            if player.lives < 0:
+                break
+
+        reward = (player.score - score) * self.score_weight
+        if player.lives != lives:
+            # Respawning refills health, which shouldn't count as a reward
+            reward += (player.lives - lives) * self.life_weight
+        elif game.level == level:
+            # As does starting a new level
+            reward += (player.health - health) * self.health_weight
+
+        done = player.lives < 0
+        info = {"score": player.score, "level": game.level + 1, "lives": player.lives,
+                "health": player.health}
+        if not done and self.max_frames is not None and self.frames >= self.max_frames:
+            done = True
+            info["truncated"] = True
+        return self.observe(game), reward, done, info
+
+
+class VectorEnv:
+    """
+    Several CavernEnvs stepped together.
+
+    Finished environments are reset straight away; their last observation
+    is kept in info["final_observation"] and the returned observation is the
+    first of the next episode. For many more worlds at once, see
+    src.batch.BatchedGame.
+    """
+
+    def __init__(self, num_envs, make_observe=None, **kwargs):
+        """
+        Args:
+            num_envs: Number of environments
+            make_observe: Optional function called once per environment to
+                create its observe function, for observers that keep state
+                (like ObservationEncoder, which reuses one array)
+            kwargs: Passed to each CavernEnv
+        """
+        if make_observe is not None:
+            self.envs = [CavernEnv(observe=make_observe(), **kwargs) for _ in range(num_envs)]
+        else:
+            self.envs = [CavernEnv(**kwargs) for _ in range(num_envs)]
+
+    @property
+    def num_envs(self):
+        return len(self.envs)
+
+    def reset(self, seed=None):
+        """
+        Reset every environment.
+
+        Args:
+            seed: Base seed; environment i uses a sub-stream derived from it
+
+        Returns:
+            List of observations
+        """
+        return [env.reset(derive_seed(seed, "env", i)) for i, env in enumerate(self.envs)]
+
+    def step(self, actions):
+        """
+        Step every environment with its action.
+
+        Args:
+            actions: Sequence of actions, one per environment
+
+        Returns:
+            Tuple of lists (observations, rewards, dones, infos)
+        """
+        observations = []
+        rewards = []
+        dones = []
+        infos = []
+        for env, action in zip(self.envs, actions):
+            observation, reward, done, info = env.step(action)
+            if done:
+                # An encoder's array is about to be overwritten by reset()
+                copy = getattr(observation, "copy", None)
+                info["final_observation"] = copy() if copy is not None else observation
+                observation = env.reset()
+            observations.append(observation)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return observations, rewards, dones, infos
@@ -1,31 +1,88 @@
 """Core game logic for Cavern."""
-from random import randint, shuffle
-from src.constants import LEVELS, NUM_COLUMNS, GRID_BLOCK_SIZE, LEVEL_X_OFFSET, WIDTH, NUM_ROWS
+from collections import namedtuple
+
+from src.constants import NUM_COLUMNS, GRID_BLOCK_SIZE, LEVEL_X_OFFSET, WIDTH
+from src.level import get_level_grid
+from src.profiling import NULL_PROFILER
+from src.spatial import OrbIndex
 from src.entities.robot import Robot
+from src.entities.bolt import Bolt
+from src.entities.effects import Pop
 from src.entities.fruit import Fruit
+from src.entities.orb import Orb
+from src.entities.registry import EntityList
+from src.rng import make_rng
+
+
+# Simulation state captured by Game.snapshot(). Entities are flat tuples from
+# get_state(); blowing_orb is an index into orbs (-1 for none).
+GameSnapshot = namedtuple("GameSnapshot", (
+    "timer", "level", "level_colour", "grid", "pending_enemies", "trapped_orbs", "rng_state",
+    "player", "blowing_orb", "fruits", "bolts", "enemies", "pops", "orbs"))
+
+
+def _fruit_alive(fruit):
+    return fruit.time_to_live > 0
+
+
+def _bolt_alive(bolt):
+    return bolt.active
+
+
+def _enemy_alive(enemy):
+    return enemy.alive
+
+
+def _pop_alive(pop):
+    return pop.timer < 12
+
+
+def _orb_alive(orb):
+    return orb.timer < 250 and orb.y > -40
 
 
 class Game:
     """Core game state and logic."""
     
-    def __init__(self, player=None):
+    def __init__(self, player=None, seed=None, profiler=None):
+        """
+        Args:
+            player: Player, or None for the attract mode behind the menu
+            seed: Seed for this game's random stream, or None for a random one
+            profiler: Optional FrameProfiler to time each part of update() with
+        """
         self.player = player
+        self.profiler = profiler or NULL_PROFILER
+        
+        # All randomness in the game comes from this stream, so a game is
+        # reproducible from its seed and doesn't disturb other games
+        self.rng = make_rng(seed)
+        
         self.level_colour = 0  # Start at 0 for valid background image
         self.level = 0  # Start at 0 instead of -1
         self.timer = -1
         
         # Initialize grid properly
-        level_data = LEVELS[0]
-        self.grid = level_data + [level_data[0]]  # Add last row
-        
-        # Entity lists
-        self.fruits = []
-        self.bolts = []
-        self.enemies = []
-        self.pops = []
-        self.orbs = []
+        self.grid = get_level_grid(0)
+        
+        # Entity lists, cleared and compacted in place rather than rebuilt.
+        # Short-lived entities are recycled through each list's free list.
+        self.fruits = EntityList(Fruit)
+        self.bolts = EntityList(Bolt)
+        self.enemies = EntityList()
+        self.pops = EntityList(Pop)
+        self.orbs = EntityList(Orb)
         self.pending_enemies = []
         
+        # Number of live orbs holding a trapped enemy
+        self.trapped_orbs = 0
+        
+        # Broad-phase index of orbs, rebuilt every frame
+        self.orb_index = OrbIndex()
+        
+        # Pre-rendered background and blocks, built on first draw of a level
+        self.level_layer = None
+        
         if player:
             # Reset to -1 so next_level() will increment to 0
             self.level_colour = -1
@@ -37,9 +94,9 @@ class Game:
         self.level_colour = (self.level_colour + 1) % 4
         self.level += 1
         
-        # Set up grid
-        self.grid = LEVELS[self.level % len(LEVELS)]
-        self.grid = self.grid + [self.grid[0]]  # Add last row
+        # Set up grid (compiled once per level, including the wrapped last row)
+        self.grid = get_level_grid(self.level)
+        self.level_layer = None
         
         self.timer = -1
         
@@ -47,11 +104,12 @@ class Game:
             self.player.reset()
         
         # Reset entity lists
-        self.fruits = []
-        self.bolts = []
-        self.enemies = []
-        self.pops = []
-        self.orbs = []
+        self.fruits.clear()
+        self.bolts.clear()
+        self.enemies.clear()
+        self.pops.clear()
+        self.orbs.clear()
+        self.trapped_orbs = 0
         
         # Create pending enemies
         num_enemies = 10 + self.level
@@ -60,7 +118,7 @@ class Game:
         
         self.pending_enemies = (num_strong_enemies * [Robot.TYPE_AGGRESSIVE] + 
                                num_weak_enemies * [Robot.TYPE_NORMAL])
-        shuffle(self.pending_enemies)
+        self.rng.shuffle(self.pending_enemies)
     
     def fire_probability(self):
         """Calculate enemy firing probability based on level."""
@@ -72,11 +130,11 @@ class Game:
     
     def get_robot_spawn_x(self):
         """Find spawn location for robot."""
-        r = randint(0, NUM_COLUMNS - 1)
+        r = self.rng.randint(0, NUM_COLUMNS - 1)
         
         for i in range(NUM_COLUMNS):
             grid_x = (r + i) % NUM_COLUMNS
-            if self.grid[0][grid_x] == ' ':
+            if not self.grid.is_solid(grid_x, 0):
                 return GRID_BLOCK_SIZE * grid_x + LEVEL_X_OFFSET + 12
         
         return WIDTH / 2
@@ -89,68 +147,153 @@ class Game:
             input_state: InputState object
             play_sound_callback: Function to call for sound effects
         """
+        profiler = self.profiler
+        profiler.mark()
         self.timer += 1
         
         # Update player
         if self.player:
             self.player.update(input_state, self.grid, self.timer, self.orbs, play_sound_callback)
+        profiler.lap("player")
+        
+        # Orbs don't move again until their own update, so index them once
+        self.orb_index.build(self.orbs)
+        profiler.lap("orb_index")
         
         # Update all entities
         for fruit in self.fruits:
             fruit.update(self.grid, self.player, self.pops, self.timer, play_sound_callback)
+        profiler.lap("fruits")
         
         for bolt in self.bolts:
-            bolt.update(self.grid, self.orbs, self.player, self.timer)
+            bolt.update(self.grid, self.orb_index, self.player, self.timer)
+        profiler.lap("bolts")
         
+        fire_probability = self.fire_probability()
         for enemy in self.enemies:
-            enemy.update(self.grid, self.player, self.orbs, self.bolts, 
-                        self.timer, self.fire_probability(), play_sound_callback)
+            enemy.update(self.grid, self.player, self.orb_index, self.bolts, 
+                        self.timer, fire_probability, self.rng, play_sound_callback)
+        profiler.lap("enemies")
         
         for pop in self.pops:
             pop.update()
+        profiler.lap("pops")
         
         for orb in self.orbs:
-            orb.update(self.grid, self.pops, self.fruits, play_sound_callback)
+            orb.update(self.grid, self.pops, self.fruits, self.rng, play_sound_callback)
+        profiler.lap("orbs")
         
         # Remove inactive entities
-        self.fruits = [f for f in self.fruits if f.time_to_live > 0]
-        self.bolts = [b for b in self.bolts if b.active]
-        self.enemies = [e for e in self.enemies if e.alive]
-        self.pops = [p for p in self.pops if p.timer < 12]
-        self.orbs = [o for o in self.orbs if o.timer < 250 and o.y > -40]
+        self.fruits.remove_dead(_fruit_alive)
+        self.bolts.remove_dead(_bolt_alive)
+        # Robots only die by being trapped in an orb
+        self.trapped_orbs += self.enemies.remove_dead(_enemy_alive)
+        self.pops.remove_dead(_pop_alive)
+        self.orbs.remove_dead(_orb_alive, self._on_orb_removed)
+        profiler.lap("cleanup")
         
         # Spawn random fruit
-        if self.timer % 100 == 0 and len(self.pending_enemies + self.enemies) > 0:
-            self.fruits.append(Fruit((randint(70, 730), randint(75, 400))))
+        if self.timer % 100 == 0 and (self.pending_enemies or self.enemies):
+            self.fruits.spawn((self.rng.randint(70, 730), self.rng.randint(75, 400)), self.rng)
         
         # Spawn enemies
         if (self.timer % 81 == 0 and len(self.pending_enemies) > 0 and 
             len(self.enemies) < self.max_enemies()):
             robot_type = self.pending_enemies.pop()
             pos = (self.get_robot_spawn_x(), -30)
-            self.enemies.append(Robot(pos, robot_type))
+            self.enemies.append(Robot(pos, robot_type, self.rng))
         
         # Check for level completion
-        if len(self.pending_enemies + self.fruits + self.enemies + self.pops) == 0:
-            if len([orb for orb in self.orbs if orb.trapped_enemy_type is not None]) == 0:
+        if not (self.pending_enemies or self.fruits or self.enemies or self.pops):
+            if self.trapped_orbs == 0:
                 self.next_level()
                 play_sound_callback("level", 1)
+        profiler.lap("spawning")
+        profiler.count_entities(self)
+    
+    def _on_orb_removed(self, orb):
+        """Keep the trapped orb count up to date and drop stale references."""
+        if orb.trapped_enemy_type is not None:
+            self.trapped_orbs -= 1
+        # The orb will be recycled, so the player must stop blowing it
+        if self.player and self.player.blowing_orb is orb:
+            self.player.blowing_orb = None
+    
+    def snapshot(self):
+        """
+        Capture the simulation state, e.g. to branch the game for lookahead.
+        
+        Only plain values are copied (the level grid is shared, as it never
+        changes), so this is far cheaper than deepcopy. Sound callbacks and
+        the draw cache are not part of the state.
+        
+        Returns:
+            GameSnapshot to pass to restore(), any number of times
+        """
+        player = self.player
+        blowing_orb = -1
+        if player and player.blowing_orb is not None:
+            blowing_orb = self.orbs.index(player.blowing_orb)
+        
+        return GameSnapshot(
+            self.timer, self.level, self.level_colour, self.grid,
+            tuple(self.pending_enemies), self.trapped_orbs, self.rng.getstate(),
+            player.get_state() if player else None, blowing_orb,
+            tuple(map(Fruit.STATE_GETTER, self.fruits)),
+            tuple(map(Bolt.STATE_GETTER, self.bolts)),
+            tuple(map(Robot.STATE_GETTER, self.enemies)),
+            tuple(map(Pop.STATE_GETTER, self.pops)),
+            tuple(map(Orb.STATE_GETTER, self.orbs)))
+    
+    def restore(self, snapshot):
+        """
+        Return to the state captured by snapshot().
+        
+        The snapshot must come from this game or another with a player if
+        this one has one. Entity objects are recycled, so references to
+        entities from before the restore are no longer meaningful.
+        
+        Args:
+            snapshot: GameSnapshot from snapshot()
+        """
+        if snapshot.level != self.level or snapshot.level_colour != self.level_colour:
+            self.level_layer = None
+        
+        self.timer = snapshot.timer
+        self.level = snapshot.level
+        self.level_colour = snapshot.level_colour
+        self.grid = snapshot.grid
+        self.pending_enemies[:] = snapshot.pending_enemies
+        self.trapped_orbs = snapshot.trapped_orbs
+        self.rng.setstate(snapshot.rng_state)
+        
+        self.fruits.restore(Fruit, snapshot.fruits)
+        self.bolts.restore(Bolt, snapshot.bolts)
+        self.enemies.restore(Robot, snapshot.enemies)
+        self.pops.restore(Pop, snapshot.pops)
+        self.orbs.restore(Orb, snapshot.orbs)
+        
+        if self.player:
+            self.player.set_state(snapshot.player)
+            self.player.blowing_orb = self.orbs[snapshot.blowing_orb] if snapshot.blowing_orb >= 0 else None
+    
+    def pool_stats(self):
+        """
+        Get entity pool counters.
+        
+        Returns:
+            Dict of list name -> (hits, misses)
+        """
+        pools = {"fruits": self.fruits, "bolts": self.bolts, "pops": self.pops, "orbs": self.orbs}
+        return {name: (pool.hits, pool.misses) for name, pool in pools.items()}
     
     def draw(self, screen):
         """Draw game state."""
-        # Draw background
-        screen.blit("bg%d" % self.level_colour, (0, 0))
-        
-        # Draw blocks
-        block_sprite = "block" + str(self.level % 4)
-        for row_y in range(NUM_ROWS):
-            row = self.grid[row_y]
-            if len(row) > 0:
-                x = LEVEL_X_OFFSET
-                for block_char in row:
-                    if block_char != ' ':
-                        screen.blit(block_sprite, (x, row_y * GRID_BLOCK_SIZE))
-                    x += GRID_BLOCK_SIZE
+        # Draw background and blocks, which only change with the level
+        if self.level_layer is None:
+            from src.render import render_level_layer
+            self.level_layer = render_level_layer(self.grid, self.level_colour, self.level % 4)
+        screen.blit(self.level_layer, (0, 0))
         
         # Draw all entities
         all_objs = self.fruits + self.bolts + self.enemies + self.pops + self.orbs
@@ -159,4 +302,4 @@ class Game:
         
         for obj in all_objs:
             if obj:
-                obj.draw()
\ No newline at end of file
+                obj.draw(screen)
\ No newline at end of file
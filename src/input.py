@@ -1,6 +1,9 @@
 """Input handling with edge detection for Cavern game."""
 from dataclasses import dataclass
 
+# Number of fields in InputState, and so of bits used by InputState.to_bits()
+INPUT_BITS = 7
+
 
 @dataclass
 class InputState:
@@ -12,14 +15,30 @@ class InputState:
     fire_pressed: bool  # Edge-detected (create orb)
     fire_held: bool     # Level (blow orb further)
     pause_pressed: bool # Edge-detected
+    
+    def to_bits(self):
+        """Pack the fields into an int, one bit each in field order from bit 0."""
+        return (bool(self.left) | bool(self.right) << 1 | bool(self.up) << 2 |
+                bool(self.jump_pressed) << 3 | bool(self.fire_pressed) << 4 |
+                bool(self.fire_held) << 5 | bool(self.pause_pressed) << 6)
+    
+    @classmethod
+    def from_bits(cls, bits):
+        """Inverse of to_bits()."""
+        return cls(*(bool(bits >> i & 1) for i in range(INPUT_BITS)))
 
 
 class InputManager:
     """Manages input state and edge detection."""
     
-    def __init__(self):
+    def __init__(self, recorder=None):
+        """
+        Args:
+            recorder: Optional InputRecorder that every InputState is written to
+        """
         self._space_was_down = False
         self._p_was_down = False
+        self.recorder = recorder
     
     def get_input_state(self, keyboard) -> InputState:
         """
@@ -49,7 +68,7 @@ class InputManager:
         else:
             self._p_was_down = False
         
-        return InputState(
+        state = InputState(
             left=keyboard.left,
             right=keyboard.right,
             up=keyboard.up,
@@ -58,3 +77,7 @@ class InputManager:
             fire_held=keyboard.space,
             pause_pressed=p_pressed
         )
+        
+        if self.recorder is not None:
+            self.recorder.record(state)
+        return state
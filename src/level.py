@@ -0,0 +1,45 @@
+"""Compiled level layouts for Cavern game."""
+from src.constants import LEVELS, NUM_ROWS, NUM_COLUMNS, GRID_BLOCK_SIZE, LEVEL_X_OFFSET
+
+
+class LevelGrid:
+    """
+    Level layout compiled once into a flat solidity bitmap.
+    
+    Tile (grid_x, grid_y) is solid if solid[grid_y * NUM_COLUMNS + grid_x]
+    is non-zero. Rows that are empty strings in LEVELS are all open.
+    """
+    
+    def __init__(self, level_data):
+        # The top row is repeated at the bottom so the level wraps vertically
+        self.rows = level_data + [level_data[0]]
+        
+        self.solid = bytearray(NUM_ROWS * NUM_COLUMNS)
+        for grid_y, row in enumerate(self.rows[:NUM_ROWS]):
+            for grid_x, char in enumerate(row[:NUM_COLUMNS]):
+                if char != " ":
+                    self.solid[grid_y * NUM_COLUMNS + grid_x] = 1
+        
+        # Screen positions of every block, for drawing
+        self.block_positions = [(LEVEL_X_OFFSET + (i % NUM_COLUMNS) * GRID_BLOCK_SIZE,
+                                 (i // NUM_COLUMNS) * GRID_BLOCK_SIZE)
+                                for i, tile in enumerate(self.solid) if tile]
+    
+    def __getitem__(self, grid_y):
+        """Get a row of the original level data as a string."""
+        return self.rows[grid_y]
+    
+    def __len__(self):
+        return len(self.rows)
+    
+    def is_solid(self, grid_x, grid_y):
+        """Check if the tile at these grid coordinates is a block."""
+        return self.solid[grid_y * NUM_COLUMNS + grid_x] != 0
+
+
+COMPILED_LEVELS = [LevelGrid(level_data) for level_data in LEVELS]
+
+
+def get_level_grid(level):
+    """Get the compiled grid for a level number, cycling through LEVELS."""
+    return COMPILED_LEVELS[level % len(COMPILED_LEVELS)]
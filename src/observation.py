@@ -0,0 +1,110 @@
+"""
+Symbolic observations of game state as NumPy channel planes.
+
+ObservationEncoder writes the level and entities into a preallocated
+(channels, rows, columns) uint8 array at tile or half-tile resolution,
+which is far cheaper to produce and to learn from than rendered frames.
+Each entity marks the cell holding its anchor point: the feet of the
+player, robots and fruit, and the centre of orbs and bolts.
+
+Requires numpy.
+"""
+import numpy as np
+
+from src.constants import NUM_ROWS, NUM_COLUMNS, GRID_BLOCK_SIZE, LEVEL_X_OFFSET
+from src.entities.robot import Robot
+
+CHANNELS = ("solid", "player", "robot_normal", "robot_aggressive", "orb", "orb_trapped",
+            "bolt", "fruit")
+
+SOLID, PLAYER, ROBOT_NORMAL, ROBOT_AGGRESSIVE, ORB, ORB_TRAPPED, BOLT, FRUIT = range(len(CHANNELS))
+
+_ROBOT_CHANNELS = {Robot.TYPE_NORMAL: ROBOT_NORMAL, Robot.TYPE_AGGRESSIVE: ROBOT_AGGRESSIVE}
+
+
+class ObservationEncoder:
+    """Encodes a Game into channel planes, overwriting the same array each time."""
+
+    def __init__(self, resolution=1, out=None):
+        """
+        Args:
+            resolution: Cells per tile along each axis: 1 for tiles, 2 for half-tiles
+            out: Optional uint8 array of shape (len(CHANNELS), rows, columns) to
+                write into, e.g. one slot of a batch or shared memory buffer
+        """
+        self.resolution = resolution
+        self.rows = NUM_ROWS * resolution
+        self.columns = NUM_COLUMNS * resolution
+        self.cell_size = GRID_BLOCK_SIZE / resolution
+
+        shape = (len(CHANNELS), self.rows, self.columns)
+        if out is None:
+            out = np.zeros(shape, dtype=np.uint8)
+        elif out.shape != shape or out.dtype != np.uint8:
+            raise ValueError(f"out must be a uint8 array of shape {shape}")
+        self._planes = out
+        self._entity_planes = out[SOLID + 1:]
+
+        # Read-only view for consumers; it changes with every encode()
+        self.planes = out.view()
+        self.planes.flags.writeable = False
+
+        # Solid plane for each level grid seen so far, at this resolution
+        self._solid_planes = {}
+        self._grid = None
+
+    def _solid_plane(self, grid):
+        plane = self._solid_planes.get(grid)
+        if plane is None:
+            plane = np.frombuffer(grid.solid, dtype=np.uint8).reshape(NUM_ROWS, NUM_COLUMNS)
+            plane = (plane != 0).astype(np.uint8)
+            if self.resolution > 1:
+                plane = plane.repeat(self.resolution, axis=0).repeat(self.resolution, axis=1)
+            self._solid_planes[grid] = plane
+        return plane
+
+    def encode(self, game):
+        """
+        Write the game's current state into the planes.
+
+        Nothing is allocated except when a level is seen for the first time.
+
+        Args:
+            game: Game to encode
+
+        Returns:
+            The read-only planes array (the same object every call)
+        """
+        planes = self._planes
+        if game.grid is not self._grid:
+            self._grid = game.grid
+            planes[SOLID] = self._solid_plane(game.grid)
+        self._entity_planes.fill(0)
+
+        # Bottom-anchored actors stand with their feet at y, so look just above
+        mark = self._mark
+        player = game.player
+        if player:
+            mark(PLAYER, player.x, player.y - 1)
+        for robot in game.enemies:
+            mark(_ROBOT_CHANNELS[robot.type], robot.x, robot.y - 1)
+        for fruit in game.fruits:
+            mark(FRUIT, fruit.x, fruit.y - 1)
+        for orb in game.orbs:
+            mark(ORB if orb.trapped_enemy_type is None else ORB_TRAPPED, orb.x, orb.y)
+        for bolt in game.bolts:
+            mark(BOLT, bolt.x, bolt.y)
+
+        return self.planes
+
+    def _mark(self, channel, x, y):
+        row = int(y // self.cell_size)
+        column = int((x - LEVEL_X_OFFSET) // self.cell_size)
+        # Entities off the edge (e.g. robots dropping in) mark the nearest cell
+        row = min(max(row, 0), self.rows - 1)
+        column = min(max(column, 0), self.columns - 1)
+        self._planes[channel, row, column] = 1
+
+    def buffer(self):
+        """Return a read-only memoryview of the planes."""
+        return memoryview(self.planes)
@@ -0,0 +1,175 @@
+"""
+Per-frame timing of the update and draw passes and of each Game.update subsystem.
+
+App and Game call into a profiler every frame. By default that is
+NULL_PROFILER, whose methods do nothing, so the hooks cost a few no-op calls
+per frame. A FrameProfiler keeps the last few hundred frames for rolling
+percentiles (shown by PlayScreen's overlay) and can write every frame to a
+CSV or JSON Lines trace, to find which subsystem caused a hitch.
+
+Sections (times in milliseconds):
+    update, draw    App.update and App.draw as a whole
+    player ... spawning
+                    the parts of Game.update, in the order they run;
+                    spawning includes the level completion check and
+                    building the next level
+"""
+import csv
+import json
+from collections import deque
+from time import perf_counter
+
+SECTIONS = ("update", "draw", "player", "orb_index", "fruits", "bolts", "enemies", "pops", "orbs",
+            "cleanup", "spawning")
+
+# Game.update sections, which overlap the update section
+GAME_SECTIONS = SECTIONS[2:]
+
+# Game entity lists counted each frame, and the fields their counts are kept in
+COUNTS = ("enemies", "orbs", "bolts", "fruits", "pops")
+COUNT_FIELDS = tuple("n_" + name for name in COUNTS)
+
+# Trace columns: frame number, time since the previous frame began, sections, entity counts
+TRACE_FIELDS = ("frame", "interval") + SECTIONS + COUNT_FIELDS
+
+
+class NullProfiler:
+    """Profiler that records nothing, used when profiling is off."""
+
+    overlay = False
+
+    def begin_frame(self):
+        pass
+
+    def add(self, section, seconds):
+        pass
+
+    def mark(self):
+        pass
+
+    def lap(self, section):
+        pass
+
+    def count_entities(self, game):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class FrameProfiler:
+    """Collects section timings and entity counts for each frame."""
+
+    def __init__(self, history=300, trace_path=None):
+        """
+        Args:
+            history: Number of recent frames kept for percentiles
+            trace_path: Optional file to write every frame to; CSV if the
+                name ends in .csv, otherwise JSON Lines
+        """
+        self.frames = deque(maxlen=history)
+        self.frame_count = 0
+        self.overlay = False
+
+        self._current = None
+        self._frame_start = None
+        self._last = 0.0
+
+        self._trace = None
+        self._writer = None
+        if trace_path is not None:
+            self._trace = open(trace_path, "w", newline="")
+            if trace_path.endswith(".csv"):
+                self._writer = csv.writer(self._trace)
+                self._writer.writerow(TRACE_FIELDS)
+
+    def begin_frame(self):
+        """Finish the previous frame, if any, and start timing a new one."""
+        now = perf_counter()
+        if self._current is not None:
+            self._end_frame(now)
+        self._frame_start = now
+        self._current = dict.fromkeys(SECTIONS, 0.0)
+        self._current.update(dict.fromkeys(COUNT_FIELDS, 0))
+
+    def _end_frame(self, now):
+        record = self._current
+        record["interval"] = now - self._frame_start
+        self.frames.append(record)
+        self.frame_count += 1
+
+        if self._trace is not None:
+            row = [self.frame_count, record["interval"] * 1000]
+            row += [record[section] * 1000 for section in SECTIONS]
+            row += [record[field] for field in COUNT_FIELDS]
+            if self._writer is not None:
+                self._writer.writerow(row)
+            else:
+                self._trace.write(json.dumps(dict(zip(TRACE_FIELDS, row))) + "\n")
+
+    def add(self, section, seconds):
+        """Add time measured by the caller to a section of this frame."""
+        if self._current is not None:
+            self._current[section] += seconds
+
+    def mark(self):
+        """Start the clock for the next lap()."""
+        self._last = perf_counter()
+
+    def lap(self, section):
+        """Add the time since the last mark() or lap() to a section."""
+        now = perf_counter()
+        if self._current is not None:
+            self._current[section] += now - self._last
+        self._last = now
+
+    def count_entities(self, game):
+        """Record the number of each kind of entity in a game this frame."""
+        current = self._current
+        if current is not None:
+            for name, field in zip(COUNTS, COUNT_FIELDS):
+                current[field] = len(getattr(game, name))
+
+    def percentiles(self, section=None, points=(50, 95, 99)):
+        """
+        Rolling frame time percentiles over the recent frames.
+
+        Args:
+            section: Section to report, or None for update + draw
+            points: Percentiles to compute
+
+        Returns:
+            Dict of percentile (and "max") -> milliseconds, empty if no
+            frames have been recorded
+        """
+        if not self.frames:
+            return {}
+        if section is None:
+            times = sorted(frame["update"] + frame["draw"] for frame in self.frames)
+        else:
+            times = sorted(frame[section] for frame in self.frames)
+        last = len(times) - 1
+        result = {point: times[min(last, round(point / 100 * last))] * 1000 for point in points}
+        result["max"] = times[-1] * 1000
+        return result
+
+    def slowest_sections(self, count=3, point=95):
+        """
+        The Game.update sections with the highest rolling percentile.
+
+        Returns:
+            List of (section, milliseconds), slowest first
+        """
+        times = [(section, self.percentiles(section, (point,)).get(point, 0.0))
+                 for section in GAME_SECTIONS]
+        times.sort(key=lambda item: item[1], reverse=True)
+        return times[:count]
+
+    def close(self):
+        """Finish the current frame and close the trace file."""
+        if self._current is not None:
+            self._end_frame(perf_counter())
+            self._current = None
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = self._writer = None
@@ -0,0 +1,176 @@
+"""
+Compact binary recording of player input.
+
+A log holds one InputState per frame, packed into a byte with
+InputState.to_bits() and run-length encoded, since held keys give long runs
+of identical frames. Together with the seed in the header, that is enough to
+re-simulate a session exactly (see src.replay).
+
+Layout (little-endian):
+    header  magic b"CVIN", version (u8), target (u8), seed (u64)
+    body    runs: state byte, then run length as an unsigned LEB128 varint
+"""
+import struct
+
+from src.input import InputState
+
+MAGIC = b"CVIN"
+VERSION = 1
+
+# What the log's frames were fed to: App.update (menus included) or Game.update
+TARGET_APP = 0
+TARGET_GAME = 1
+
+_HEADER = struct.Struct("<4sBBQ")
+
+# Encoded runs are written to disk in chunks of about this many bytes
+BUFFER_SIZE = 64 * 1024
+
+
+class InputRecorder:
+    """Writes InputStates to a log file as they are produced."""
+
+    def __init__(self, path, seed, target=TARGET_APP):
+        """
+        Args:
+            path: File to write
+            seed: Seed the recorded session was started with (0 to 2**64 - 1)
+            target: TARGET_APP or TARGET_GAME
+        """
+        if not 0 <= seed < 2 ** 64:
+            raise ValueError(f"seed {seed} can't be recorded (must fit in 64 bits unsigned)")
+
+        self.path = path
+        self.seed = seed
+        self.target = target
+        self.frames = 0
+
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, target, seed))
+        self._buffer = bytearray()
+
+        # Current run of identical frames
+        self._bits = None
+        self._count = 0
+
+    def record(self, input_state):
+        """Add one frame."""
+        bits = input_state.to_bits()
+        if bits == self._bits:
+            self._count += 1
+        else:
+            self._end_run()
+            self._bits = bits
+            self._count = 1
+        self.frames += 1
+
+    def _end_run(self):
+        if self._count == 0:
+            return
+
+        buffer = self._buffer
+        buffer.append(self._bits)
+        count = self._count
+        while count >= 0x80:
+            buffer.append(count & 0x7F | 0x80)
+            count >>= 7
+        buffer.append(count)
+        self._count = 0
+
+        if len(buffer) >= BUFFER_SIZE:
+            self._file.write(buffer)
+            buffer.clear()
+
+    def close(self):
+        """Write out the last run and close the file. Safe to call twice."""
+        if self._file.closed:
+            return
+        self._end_run()
+        self._file.write(self._buffer)
+        self._buffer.clear()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class InputLog:
+    """A recorded input log loaded into memory."""
+
+    def __init__(self, seed, target, runs, version=VERSION):
+        """
+        Args:
+            seed: Seed the session was started with
+            target: TARGET_APP or TARGET_GAME
+            runs: List of (state bits, frame count) pairs
+            version: Format version the log was written with
+        """
+        self.seed = seed
+        self.target = target
+        self.runs = runs
+        self.version = version
+        self.frames = sum(count for _, count in runs)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a log file.
+
+        Raises:
+            ValueError: If the file isn't an input log or is a newer version
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path}: too short to be an input log")
+        magic, version, target, seed = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an input log")
+        if version > VERSION:
+            raise ValueError(f"{path}: log version {version} is newer than supported ({VERSION})")
+
+        runs = []
+        i, end = _HEADER.size, len(data)
+        while i < end:
+            bits = data[i]
+            count = shift = 0
+            while True:
+                i += 1
+                if i >= end:
+                    raise ValueError(f"{path}: truncated run at byte {i}")
+                byte = data[i]
+                count |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            i += 1
+            runs.append((bits, count))
+
+        return cls(seed, target, runs, version)
+
+    def states(self, limit=None):
+        """
+        Generate the recorded InputStates, one per frame.
+
+        Frames with the same inputs share one InputState object, so callers
+        must not modify them.
+
+        Args:
+            limit: Stop after this many frames (default: all of them)
+        """
+        remaining = self.frames if limit is None else min(limit, self.frames)
+        cache = {}
+        for bits, count in self.runs:
+            if remaining <= 0:
+                return
+            state = cache.get(bits)
+            if state is None:
+                state = cache[bits] = InputState.from_bits(bits)
+            count = min(count, remaining)
+            remaining -= count
+            for _ in range(count):
+                yield state
@@ -0,0 +1,385 @@
+"""
+Rendering helpers for Cavern game.
+
+Unlike the simulation modules, these need pygame and Pygame Zero's image
+loader, so they are only imported from draw code.
+"""
+import os
+from collections import Counter
+from math import floor
+
+import pygame
+from pgzero import loaders
+from pgzero.loaders import images
+from pgzero.screen import Screen, make_color
+
+from src.constants import WIDTH, HEIGHT, CHAR_WIDTH, IMAGE_WIDTH
+from src.sprites import IMAGES_DIR
+from src.utils import char_width, text_width
+
+# Characters that have a font0NN image
+FONT_CHARS = " 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Rendered strings kept by placed_text() before the cache is emptied
+TEXT_CACHE_SIZE = 256
+
+# Top of the status bar drawn by render_status()
+STATUS_Y = 450
+
+# Point size of the profiler overlay text
+PROFILE_FONT_SIZE = 20
+
+# Width and height of the loading screen's progress bar
+PROGRESS_BAR_SIZE = (400, 16)
+
+
+def offscreen_screen():
+    """
+    Set up drawing without a window, for replays and benchmarks.
+    
+    Uses SDL's dummy video driver unless another one was chosen, and points
+    Pygame Zero's loaders at the game's resources as its runner would
+    (serving sprites from the texture atlas if one has been built).
+    
+    Returns:
+        Pygame Zero Screen wrapping the (invisible) display surface
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    loaders.set_root(os.path.dirname(IMAGES_DIR))
+    from src.atlas import install_atlas
+    install_atlas()
+    return Screen(surface)
+
+
+def render_level_layer(grid, level_colour, block_index):
+    """
+    Pre-render the static part of a level: background plus blocks.
+    
+    Args:
+        grid: LevelGrid for the level
+        level_colour: Background colour index
+        block_index: Block sprite index
+        
+    Returns:
+        Opaque pygame Surface the size of the screen
+    """
+    layer = pygame.Surface((WIDTH, HEIGHT))
+    if pygame.display.get_surface() is not None:
+        # Match the display format so the per-frame blit is a plain copy
+        layer = layer.convert()
+    
+    layer.blit(images.load("bg%d" % level_colour), (0, 0))
+    block_sprite = images.load("block%d" % block_index)
+    for pos in grid.block_positions:
+        layer.blit(block_sprite, pos)
+    return layer
+
+
+def _alpha_surface(size):
+    """Transparent surface in the display's format where there is one."""
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+
+class GlyphAtlas:
+    """
+    Every font glyph packed side by side in a single surface.
+    
+    Strings are built by blitting areas of the atlas, instead of looking up
+    a "font0NN" image by name for every character.
+    """
+    
+    def __init__(self):
+        glyphs = [images.load("font0" + str(ord(char))) for char in FONT_CHARS]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        self.height = max(glyph.get_height() for glyph in glyphs)
+        self.surface = _alpha_surface((width, self.height))
+        
+        # Source rect within the atlas for each character
+        self.areas = {}
+        x = 0
+        for char, glyph in zip(FONT_CHARS, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            self.areas[char] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+    
+    def render_onto(self, surface, text, pos):
+        """Draw text onto a surface with its top-left at pos."""
+        x, y = pos
+        for char in text:
+            area = self.areas.get(char)
+            if area is None:
+                # Not in the atlas; load it the old way so a missing glyph
+                # fails the same as before
+                surface.blit(images.load("font0" + str(ord(char))), (x, y))
+            else:
+                surface.blit(self.surface, (x, y), area)
+            x += char_width(char)
+    
+    def render(self, text):
+        """Render a whole string to a new transparent surface."""
+        # Glyph images can be a little wider than the character advance
+        width = x = 0
+        for char in text:
+            area = self.areas.get(char)
+            if area is not None:
+                width = max(width, x + area.width)
+            x += char_width(char)
+        surface = _alpha_surface((max(width, x, 1), self.height))
+        self.render_onto(surface, text, (0, 0))
+        return surface
+
+
+_glyph_atlas = None
+_text_cache = {}
+
+
+def glyph_atlas():
+    """Return the shared GlyphAtlas, building it on first use."""
+    global _glyph_atlas
+    if _glyph_atlas is None:
+        _glyph_atlas = GlyphAtlas()
+    return _glyph_atlas
+
+
+def placed_text(text, y, x=None):
+    """
+    Rendered surface and top-left position for a line of text.
+    
+    Results are cached by (text, position), so drawing the same text in the
+    same place each frame costs a dictionary lookup and one blit.
+    
+    Args:
+        text: String to draw
+        y: Top of the text
+        x: Left of the text, or None to centre it on the screen
+        
+    Returns:
+        Tuple of (surface, (x, y))
+    """
+    key = (text, y, x)
+    placed = _text_cache.get(key)
+    if placed is None:
+        if len(_text_cache) >= TEXT_CACHE_SIZE:
+            _text_cache.clear()
+        if x is None:
+            x = (WIDTH - text_width(text)) // 2
+        placed = (glyph_atlas().render(text), (x, y))
+        _text_cache[key] = placed
+    return placed
+
+
+def render_status(score, level, lives, health):
+    """
+    Pre-render the status bar along the bottom of the play screen.
+    
+    Args:
+        score: Player score
+        level: Level index (shown as level + 1)
+        lives: Lives remaining
+        health: Current health
+        
+    Returns:
+        Transparent surface to blit at (0, STATUS_Y)
+    """
+    atlas = glyph_atlas()
+    bar = _alpha_surface((WIDTH, HEIGHT - STATUS_Y))
+    
+    # Score (right-justified) and level number; text sits a pixel lower than the icons
+    text_y = 451 - STATUS_Y
+    score_str = str(score)
+    atlas.render_onto(bar, score_str, (WIDTH - 2 - (CHAR_WIDTH[0] * len(score_str)), text_y))
+    level_str = "LEVEL " + str(level + 1)
+    atlas.render_onto(bar, level_str, ((WIDTH - text_width(level_str)) // 2, text_y))
+    
+    # Lives and health
+    lives_health = ["life"] * min(2, lives)
+    if lives > 2:
+        lives_health.append("plus")
+    if lives >= 0:
+        lives_health += ["health"] * health
+    
+    x = 0
+    for image in lives_health:
+        bar.blit(images.load(image), (x, 0))
+        x += IMAGE_WIDTH[image]
+    return bar
+
+
+def render_profile_overlay(lines):
+    """
+    Pre-render lines of profiler text on a dark translucent panel.
+    
+    The game font has no lower case or punctuation, so this uses pygame's
+    default font.
+    
+    Args:
+        lines: Strings to show, one per line
+    
+    Returns:
+        Surface to blit at the top left of the screen
+    """
+    if not pygame.font.get_init():
+        pygame.font.init()
+    font = pygame.font.Font(None, PROFILE_FONT_SIZE)
+    rendered = [font.render(line, True, (255, 255, 255)) for line in lines]
+    line_height = font.get_linesize()
+    
+    width = max((text.get_width() for text in rendered), default=0) + 8
+    panel = _alpha_surface((width, line_height * len(rendered) + 8))
+    panel.fill((0, 0, 0, 160))
+    for i, text in enumerate(rendered):
+        panel.blit(text, (4, 4 + i * line_height))
+    return panel
+
+
+_progress_bars = {}
+
+
+def render_progress_bar(fraction):
+    """
+    Pre-render a progress bar, centred below the middle of the screen.
+    
+    Bars are cached by filled width, so redrawing the same progress is a
+    dictionary lookup.
+    
+    Args:
+        fraction: Progress from 0 to 1
+        
+    Returns:
+        Tuple of (surface, (x, y))
+    """
+    filled = round(PROGRESS_BAR_SIZE[0] * min(max(fraction, 0.0), 1.0))
+    bar = _progress_bars.get(filled)
+    if bar is None:
+        bar = pygame.Surface(PROGRESS_BAR_SIZE)
+        bar.fill((40, 40, 40))
+        bar.fill((255, 255, 255), (0, 0, filled, PROGRESS_BAR_SIZE[1]))
+        _progress_bars[filled] = bar
+    return bar, ((WIDTH - PROGRESS_BAR_SIZE[0]) // 2, 260)
+
+
+class DirtyRectScreen:
+    """
+    Screen wrapper that only redraws and pushes the regions that changed.
+    
+    Draw code uses it exactly like Pygame Zero's screen. Blits and fills are
+    recorded, and present() composites them onto the real screen: anything
+    drawn with the same image at the same position as last frame is left
+    alone, and only the areas of sprites that appeared, moved or disappeared
+    are repainted (by replaying the frame's draw calls clipped to them).
+    
+    Each frame must start with an opaque full-screen blit or fill, which all
+    screens do (cached level layer, game over fill). A new background, such
+    as after a level or screen change, makes the whole screen dirty, so that
+    case falls back to a full redraw.
+    """
+    
+    def __init__(self, screen):
+        """
+        Args:
+            screen: Pygame Zero screen object to draw onto
+        """
+        self.screen = screen
+        self.surface = screen.surface
+        self.width, self.height = screen.width, screen.height
+        self._screen_rect = pygame.Rect(0, 0, self.width, self.height)
+        self._items = []
+        self._previous_items = []
+        self._previous = Counter()
+        self._previous_rects = {}
+        
+        # Regions pushed by the last present(), or None for the whole screen
+        self.dirty_rects = None
+        
+        # Fill rate statistics
+        self.frames = 0
+        self.pixels_pushed = 0
+    
+    def fill(self, color):
+        """Fill the screen with a colour."""
+        self._items.append((("fill", make_color(color)), self._screen_rect, None, None))
+    
+    def clear(self):
+        """Clear the screen to black."""
+        self.fill((0, 0, 0))
+    
+    def blit(self, image, pos):
+        """Draw a sprite (Surface or image name) with its top-left at pos."""
+        if isinstance(image, str):
+            image = images.load(image)
+        x, y = tuple(pos)[:2]
+        width, height = image.get_size()
+        # Allow a pixel either side for however pygame rounds float positions
+        rect = pygame.Rect(floor(x) - 1, floor(y) - 1, width + 2, height + 2)
+        self._items.append((("blit", id(image), x, y), rect, image, (x, y)))
+    
+    def _draw_items(self, items):
+        for key, rect, image, pos in items:
+            if image is None:
+                self.surface.fill(key[1])
+            else:
+                self.surface.blit(image, pos)
+    
+    def present(self):
+        """
+        Draw this frame's recorded calls onto the real screen.
+        
+        Sets dirty_rects to the list of regions that changed, or None if the
+        whole screen was redrawn.
+        """
+        items, self._items = self._items, []
+        keys = Counter(item[0] for item in items)
+        rects = {item[0]: item[1] for item in items}
+        
+        full = (not self._previous or not items or
+                not items[0][1].contains(self._screen_rect))
+        
+        if not full:
+            changed = [self._previous_rects[key] for key in self._previous - keys]
+            changed += [rects[key] for key in keys - self._previous]
+            regions = self._merge(changed)
+            if any(region == self._screen_rect for region in regions):
+                full = True
+        
+        if full:
+            self._draw_items(items)
+            self.dirty_rects = None
+            self.pixels_pushed += self.width * self.height
+        else:
+            for region in regions:
+                self.surface.set_clip(region)
+                self._draw_items([item for item in items if item[1].colliderect(region)])
+            self.surface.set_clip(None)
+            self.dirty_rects = regions
+            self.pixels_pushed += sum(region.width * region.height for region in regions)
+        
+        self.frames += 1
+        # Holding on to last frame's surfaces stops their ids being reused
+        self._previous_items = items
+        self._previous = keys
+        self._previous_rects = rects
+    
+    def _merge(self, rects):
+        """Clip rects to the screen and union any that overlap."""
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self._screen_rect)
+            if rect.width == 0 or rect.height == 0:
+                continue
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+    
+    def fill_ratio(self):
+        """Average fraction of the screen pushed per frame."""
+        if self.frames == 0:
+            return 1.0
+        return self.pixels_pushed / (self.frames * self.width * self.height)
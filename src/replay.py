@@ -0,0 +1,103 @@
+"""
+Replay a recorded input log as fast as possible.
+
+Logs recorded from the game (INPUT_RECORDING_PATH in src.constants) drive
+App.step, menus and all; logs from `python -m src.sim --record` drive
+Game.update the way src.sim does. There is no frame limiter and, unless
+--render is given, nothing is drawn.
+
+Usage:
+    python -m src.replay session.cvin [--frames N] [--render]
+"""
+import argparse
+import time
+
+from src.app import App
+from src.recording import InputLog, TARGET_APP
+from src.sim import null_sound, play
+
+
+def replay_app(log, frames=None, screen=None):
+    """
+    Feed a log to a fresh App seeded from the log.
+
+    Args:
+        log: InputLog recorded with TARGET_APP
+        frames: Stop after this many frames (default: the whole log)
+        screen: Screen to draw every frame to, or None to skip drawing
+
+    Returns:
+        Dict of replay statistics
+    """
+    app = App(null_sound, log.seed)
+    count = 0
+
+    start = time.perf_counter()
+    for input_state in log.states(frames):
+        app.step(input_state)
+        if screen is not None:
+            app.draw(screen)
+        count += 1
+    elapsed = time.perf_counter() - start
+
+    current = app.current_screen
+    stats = {
+        "frames": count,
+        "seconds": elapsed,
+        "ticks_per_sec": count / elapsed if elapsed > 0 else float("inf"),
+        "screen": type(current).__name__,
+    }
+    game = getattr(current, "game", None)
+    if game is not None and game.player is not None:
+        stats["level"] = game.level + 1
+        stats["score"] = game.player.score
+    return stats
+
+
+def replay(log, frames=None, render=False):
+    """
+    Replay a log against whatever it was recorded from.
+
+    Args:
+        log: InputLog
+        frames: Stop after this many frames (default: the whole log)
+        render: Draw every frame offscreen (App logs only)
+
+    Returns:
+        Dict of replay statistics
+    """
+    if log.target == TARGET_APP:
+        screen = None
+        if render:
+            from src.render import offscreen_screen
+            screen = offscreen_screen()
+        return replay_app(log, frames, screen)
+
+    if render:
+        raise ValueError("only logs recorded from the game can be rendered")
+    return play(log.states(frames), log.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded input log at full speed.")
+    parser.add_argument("log", help="input log to replay")
+    parser.add_argument("--frames", type=int, default=None, help="stop after this many frames")
+    parser.add_argument("--render", action="store_true", help="draw every frame offscreen")
+    args = parser.parse_args(argv)
+
+    log = InputLog.load(args.log)
+    if args.render and log.target != TARGET_APP:
+        parser.error("only logs recorded from the game can be rendered")
+    print(f"{args.log}: {log.frames} frames in {len(log.runs)} runs, seed {log.seed}")
+
+    stats = replay(log, args.frames, args.render)
+    print(f"{stats['frames']} frames in {stats['seconds']:.3f}s "
+          f"({stats['ticks_per_sec']:.0f} ticks/sec)")
+    if "screen" in stats:
+        print(f"final screen: {stats['screen']}")
+    if "score" in stats:
+        print(f"level: {stats['level']}  score: {stats['score']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Seeded random number streams for Cavern.
+
+Each Game owns a random.Random and passes it to the entities that need
+random numbers, so sessions in the same process don't disturb each other
+and a session is reproducible from its seed alone.
+
+derive_seed() splits one seed into independent named sub-streams, e.g. for
+the games in a long run, the workers of a rollout, or the sound system.
+Derived seeds come from a hash of the parent seed and the names, so they
+are the same in every process and on every platform (unlike hash()).
+"""
+import hashlib
+import os
+import random
+
+
+def derive_seed(seed, *names):
+    """
+    Derive the seed of a named sub-stream.
+
+    Args:
+        seed: Parent seed (int or str), or None
+        names: Any number of names or indexes identifying the sub-stream
+
+    Returns:
+        Non-negative 64-bit integer seed, or None if seed is None (an
+        unseeded stream has unseeded sub-streams)
+    """
+    if seed is None:
+        return None
+    data = repr((seed,) + names).encode()
+    return int.from_bytes(hashlib.sha256(data).digest()[:8], "little")
+
+
+def make_rng(seed=None, *names):
+    """
+    Create a random stream.
+
+    Args:
+        seed: Seed, or None to seed from the operating system
+        names: Optional sub-stream names passed to derive_seed()
+
+    Returns:
+        random.Random instance
+    """
+    if names:
+        seed = derive_seed(seed, *names)
+    return random.Random(seed)
+
+
+def new_seed():
+    """Return a fresh 64-bit seed from the operating system."""
+    return int.from_bytes(os.urandom(8), "little")
@@ -0,0 +1,261 @@
+"""
+Run many headless game sessions in parallel and aggregate the results.
+
+Sessions are spread over a ProcessPoolExecutor. Each worker builds its own
+Game from a seed and policy name, so only those go out and only a small
+dict of results comes back. A session is one game, played until game over
+or until its frame budget runs out.
+
+Policies:
+    random  mash keys like src.sim (key choices come from the session seed)
+    idle    no input
+    script  play the inputs of a log recorded from a Game (src.sim --record)
+            on each session's seed; the session ends when the log does.
+            src.replay reproduces the recorded game itself
+
+Usage:
+    python -m src.rollout --sessions 64 --frames 5000 [--policy random]
+        [--script session.cvin] [--workers N] [--jsonl results.jsonl]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from types import SimpleNamespace
+
+from src.entities.player import Player
+from src.game import Game
+from src.input import InputManager
+from src.recording import InputLog, TARGET_GAME
+from src.rng import derive_seed, make_rng
+from src.sim import RandomKeyboard, null_sound
+
+POLICIES = ("random", "idle", "script")
+
+# Input logs already loaded by this process, by path
+_scripts = {}
+
+
+def policy_inputs(policy, seed, script=None):
+    """
+    Generate InputStates for a policy.
+
+    Args:
+        policy: One of POLICIES
+        seed: Session seed
+        script: Input log path, for the "script" policy
+
+    Returns:
+        Iterator of InputState, endless except for "script"
+
+    Raises:
+        ValueError: If the script was recorded from the App (it would
+            start with menu input) rather than a Game
+    """
+    if policy == "script":
+        log = _scripts.get(script)
+        if log is None:
+            log = InputLog.load(script)
+            if log.target != TARGET_GAME:
+                raise ValueError(f"{script} was recorded from the app, not a game "
+                                 "(record one with src.sim --record)")
+            _scripts[script] = log
+        return log.states()
+
+    if policy == "random":
+        keyboard = RandomKeyboard(make_rng(seed, "policy"))
+        next_keys = keyboard.next
+    elif policy == "idle":
+        idle_keys = SimpleNamespace(left=False, right=False, up=False, space=False, p=False)
+        next_keys = lambda: idle_keys
+    else:
+        raise ValueError(f"unknown policy {policy!r} (expected one of {', '.join(POLICIES)})")
+
+    input_manager = InputManager()
+
+    def generate():
+        while True:
+            yield input_manager.get_input_state(next_keys())
+
+    return generate()
+
+
+def run_session(seed, frames, policy="random", script=None):
+    """
+    Play one game.
+
+    Args:
+        seed: Game seed (the policy's own randomness is derived from it)
+        frames: Frame budget
+        policy: One of POLICIES
+        script: Input log path, for the "script" policy
+
+    Returns:
+        Dict of session results
+    """
+    game = Game(Player(), seed=seed)
+    player = game.player
+    lives = player.lives
+    deaths = 0
+    played = 0
+
+    start = time.perf_counter()
+    for input_state in policy_inputs(policy, seed, script):
+        if played >= frames:
+            break
+        game.update(input_state, null_sound)
+        played += 1
+
+        if player.lives != lives:
+            if player.lives < lives:
+                deaths += 1
+            lives = player.lives
+            if lives < 0:
+                break
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seed": seed,
+        "policy": policy,
+        "frames": played,
+        "seconds": elapsed,
+        "score": player.score,
+        "level": game.level + 1,
+        "deaths": deaths,
+        "game_over": player.lives < 0,
+    }
+
+
+def _run_session_args(args):
+    return run_session(*args)
+
+
+def rollout(seeds, frames, policy="random", script=None, workers=None, chunksize=None):
+    """
+    Run a session for each seed, in parallel.
+
+    Args:
+        seeds: Sequence of session seeds
+        frames: Frame budget per session
+        policy: One of POLICIES
+        script: Input log path, for the "script" policy
+        workers: Number of processes (default: one per core); 1 runs the
+            sessions in this process
+        chunksize: Sessions sent to a worker at a time (default: a few
+            chunks per worker)
+
+    Yields:
+        Session result dicts, in the order of seeds, as they complete
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r} (expected one of {', '.join(POLICIES)})")
+    if policy == "script" and script is None:
+        raise ValueError("the script policy needs an input log")
+
+    args = zip(seeds, repeat(frames), repeat(policy), repeat(script))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError(f"workers must be at least 1, not {workers}")
+    if workers == 1:
+        yield from map(_run_session_args, args)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(seeds) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_run_session_args, args, chunksize=chunksize)
+
+
+def aggregate(results, wall_seconds=None):
+    """
+    Summarise session results.
+
+    Args:
+        results: List of session result dicts
+        wall_seconds: Elapsed real time for the whole rollout, if known
+
+    Returns:
+        Dict of aggregate statistics
+    """
+    if not results:
+        return {"sessions": 0}
+
+    scores = [result["score"] for result in results]
+    levels = [result["level"] for result in results]
+    deaths = [result["deaths"] for result in results]
+    frames = sum(result["frames"] for result in results)
+    session_seconds = sum(result["seconds"] for result in results)
+
+    stats = {
+        "sessions": len(results),
+        "frames": frames,
+        "session_seconds": session_seconds,
+        "score_mean": statistics.fmean(scores),
+        "score_median": statistics.median(scores),
+        "score_stdev": statistics.pstdev(scores),
+        "score_max": max(scores),
+        "level_mean": statistics.fmean(levels),
+        "level_max": max(levels),
+        "deaths_mean": statistics.fmean(deaths),
+        "game_overs": sum(1 for result in results if result["game_over"]),
+        "ticks_per_sec_per_worker": frames / session_seconds if session_seconds > 0 else float("inf"),
+    }
+    if wall_seconds is not None:
+        stats["wall_seconds"] = wall_seconds
+        stats["ticks_per_sec"] = frames / wall_seconds if wall_seconds > 0 else float("inf")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many headless sessions across all cores.")
+    parser.add_argument("--sessions", type=int, default=64, help="number of sessions")
+    parser.add_argument("--frames", type=int, default=5000, help="frame budget per session")
+    parser.add_argument("--seed", type=int, default=0, help="seed the session seeds are derived from")
+    parser.add_argument("--policy", choices=POLICIES, default="random", help="input policy")
+    parser.add_argument("--script", metavar="LOG", help="input log for the script policy")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--jsonl", metavar="PATH", help="write each session's results to this file")
+    args = parser.parse_args(argv)
+
+    if args.sessions < 1:
+        parser.error("--sessions must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.policy == "script":
+        if args.script is None:
+            parser.error("--policy script needs --script LOG")
+        try:
+            policy_inputs("script", None, args.script)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    seeds = [derive_seed(args.seed, "session", i) for i in range(args.sessions)]
+    out = open(args.jsonl, "w") if args.jsonl else None
+    results = []
+
+    start = time.perf_counter()
+    try:
+        for result in rollout(seeds, args.frames, args.policy, args.script, args.workers):
+            results.append(result)
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+    finally:
+        if out is not None:
+            out.close()
+    stats = aggregate(results, time.perf_counter() - start)
+
+    print(f"{stats['sessions']} sessions, {stats['frames']} frames in {stats['wall_seconds']:.3f}s "
+          f"({stats['ticks_per_sec']:.0f} ticks/sec, "
+          f"{stats['ticks_per_sec_per_worker']:.0f} per worker)")
+    print(f"score: mean {stats['score_mean']:.0f}  median {stats['score_median']:.0f}  "
+          f"max {stats['score_max']}")
+    print(f"level: mean {stats['level_mean']:.2f}  max {stats['level_max']}  "
+          f"deaths: mean {stats['deaths_mean']:.2f}  game overs: {stats['game_overs']}")
+
+
+if __name__ == "__main__":
+    main()
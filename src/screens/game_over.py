@@ -6,9 +6,18 @@ from src.constants import WIDTH, IMAGE_WIDTH, CHAR_WIDTH
 class GameOverScreen:
     """Game over screen."""
     
-    def __init__(self, final_score, final_level):
+    def __init__(self, final_score, final_level, seed=None, profiler=None):
+        """
+        Args:
+            final_score: Score to show
+            final_level: Level number to show
+            seed: Seed for the following games, or None for random games
+            profiler: Optional FrameProfiler for the following games
+        """
         self.final_score = final_score
         self.final_level = final_level
+        self.seed = seed
+        self.profiler = profiler
     
     def update(self, input_state, play_sound_callback):
         """
@@ -20,7 +29,7 @@ class GameOverScreen:
         if input_state.fire_pressed:
             # Return to menu
             from src.screens.menu import MenuScreen
-            return MenuScreen()
+            return MenuScreen(self.seed, self.profiler)
         
         return None
     
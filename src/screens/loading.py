@@ -0,0 +1,36 @@
+"""Loading screen for Cavern game."""
+from src.utils import draw_text
+
+
+class LoadingScreen:
+    """Shows progress while assets preload in the background."""
+    
+    def __init__(self, preloader, next_screen):
+        """
+        Args:
+            preloader: Started AssetPreloader
+            next_screen: Screen to show once loading has finished
+        """
+        self.preloader = preloader
+        self.next_screen = next_screen
+    
+    def update(self, input_state, play_sound_callback):
+        """
+        Update loading screen.
+        
+        Returns:
+            Next screen once every asset has loaded, or None while loading
+        """
+        if self.preloader.done:
+            return self.next_screen
+        return None
+    
+    def draw(self, screen):
+        """Draw loading screen."""
+        from src.render import render_progress_bar
+        
+        screen.fill((0, 0, 0))
+        draw_text(screen, "LOADING", 180)
+        
+        bar, pos = render_progress_bar(self.preloader.progress)
+        screen.blit(bar, pos)
@@ -1,13 +1,22 @@
 """Menu screen for Cavern game."""
 from src.game import Game
+from src.rng import derive_seed
 
 
 class MenuScreen:
     """Main menu screen."""
     
-    def __init__(self):
+    def __init__(self, seed=None, profiler=None):
+        """
+        Args:
+            seed: Seed for this and all following games, or None for random games
+            profiler: Optional FrameProfiler for this and all following games
+        """
+        self.seed = seed
+        self.profiler = profiler
+        
         # Create game without player for background animation
-        self.game = Game()
+        self.game = Game(seed=derive_seed(seed, "menu"), profiler=profiler)
     
     def update(self, input_state, play_sound_callback):
         """
@@ -19,7 +28,7 @@ class MenuScreen:
         if input_state.fire_pressed:
             # Start new game
             from src.screens.play import PlayScreen
-            return PlayScreen()
+            return PlayScreen(derive_seed(self.seed, "play"), self.profiler)
         
         # Update background game
         from src.input import InputState
@@ -2,15 +2,34 @@
 from src.game import Game
 from src.entities.player import Player
 from src.utils import draw_text
-from src.constants import WIDTH, IMAGE_WIDTH, CHAR_WIDTH
+from src.rng import derive_seed
+
+# Frames between refreshes of the profiler overlay
+PROFILE_OVERLAY_INTERVAL = 15
 
 
 class PlayScreen:
     """Main gameplay screen."""
     
-    def __init__(self):
-        self.game = Game(Player())
+    def __init__(self, seed=None, profiler=None):
+        """
+        Args:
+            seed: Seed for this and all following games, or None for random games
+            profiler: Optional FrameProfiler for this and all following games;
+                its overlay is drawn while profiler.overlay is set
+        """
+        self.seed = seed
+        self.profiler = profiler
+        self.game = Game(Player(), seed=seed, profiler=profiler)
         self.paused = False
+        
+        # Pre-rendered status bar and the values it shows
+        self._status_surface = None
+        self._status_key = None
+        
+        # Pre-rendered profiler overlay and the frame it was last refreshed on
+        self._overlay_surface = None
+        self._overlay_frame = None
     
     def update(self, input_state, play_sound_callback):
         """
@@ -32,7 +51,8 @@ class PlayScreen:
         if self.game.player.lives < 0:
             play_sound_callback("over")
             from src.screens.game_over import GameOverScreen
-            return GameOverScreen(self.game.player.score, self.game.level + 1)
+            return GameOverScreen(self.game.player.score, self.game.level + 1,
+                                  derive_seed(self.seed, "next"), self.profiler)
         
         # Update game
         self.game.update(input_state, play_sound_callback)
@@ -50,28 +70,52 @@ class PlayScreen:
         # Draw pause overlay if paused
         if self.paused:
             self._draw_pause_overlay(screen)
+        
+        if self.profiler is not None and self.profiler.overlay:
+            self._draw_profile_overlay(screen)
     
     def _draw_status(self, screen):
-        """Draw status bar with score, level, lives, and health."""
-        # Display score (right-justified)
-        number_width = CHAR_WIDTH[0]
-        score_str = str(self.game.player.score)
-        draw_text(screen, score_str, 451, WIDTH - 2 - (number_width * len(score_str)))
-        
-        # Display level number
-        draw_text(screen, "LEVEL " + str(self.game.level + 1), 451)
-        
-        # Display lives and health
-        lives_health = ["life"] * min(2, self.game.player.lives)
-        if self.game.player.lives > 2:
-            lives_health.append("plus")
-        if self.game.player.lives >= 0:
-            lives_health += ["health"] * self.game.player.health
-        
-        x = 0
-        for image in lives_health:
-            screen.blit(image, (x, 450))
-            x += IMAGE_WIDTH[image]
+        """
+        Draw status bar with score, level, lives, and health.
+        
+        The bar is only re-rendered when one of those values changes.
+        """
+        from src.render import STATUS_Y, render_status
+        
+        player = self.game.player
+        key = (player.score, self.game.level, player.lives, player.health)
+        if key != self._status_key:
+            self._status_surface = render_status(*key)
+            self._status_key = key
+        
+        screen.blit(self._status_surface, (0, STATUS_Y))
+    
+    def _draw_profile_overlay(self, screen):
+        """
+        Draw rolling frame time percentiles, the slowest parts of the
+        update and entity counts.
+        
+        The text is re-rendered a few times a second rather than every frame.
+        """
+        from src.render import render_profile_overlay
+        
+        profiler = self.profiler
+        frame = profiler.frame_count
+        if self._overlay_frame is None or frame - self._overlay_frame >= PROFILE_OVERLAY_INTERVAL:
+            times = profiler.percentiles()
+            lines = []
+            if times:
+                lines.append("frame ms  p50 {:.2f}  p95 {:.2f}  p99 {:.2f}  max {:.2f}".format(
+                    times[50], times[95], times[99], times["max"]))
+                lines.append("p95 ms  " + "  ".join(
+                    f"{section} {ms:.2f}" for section, ms in profiler.slowest_sections()))
+            game = self.game
+            lines.append(f"enemies {len(game.enemies)}  orbs {len(game.orbs)}  "
+                         f"bolts {len(game.bolts)}  fruits {len(game.fruits)}  pops {len(game.pops)}")
+            self._overlay_surface = render_profile_overlay(lines)
+            self._overlay_frame = frame
+        
+        screen.blit(self._overlay_surface, (0, 0))
     
     def _draw_pause_overlay(self, screen):
         """Draw pause overlay."""
@@ -0,0 +1,146 @@
+"""
+Headless simulation runner for Cavern.
+
+Steps Game with no window, renderer or audio and reports ticks/sec.
+
+Usage:
+    python -m src.sim --frames 10000 --seed 1 [--record session.cvin]
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from src.entities.player import Player
+from src.game import Game
+from src.input import InputManager
+from src.recording import InputRecorder, TARGET_GAME
+from src.rng import derive_seed
+
+
+def null_sound(name, count=1):
+    """Sound callback that does nothing."""
+
+
+class RandomKeyboard:
+    """Stand-in for Pygame Zero's keyboard that mashes keys at random."""
+
+    HOLD_FRAMES = 8
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.frame = 0
+        self.keys = SimpleNamespace(left=False, right=False, up=False, space=False, p=False)
+
+    def next(self):
+        """Advance one frame and return the current key states."""
+        if self.frame % RandomKeyboard.HOLD_FRAMES == 0:
+            direction = self.rng.randint(-1, 1)
+            self.keys.left = direction < 0
+            self.keys.right = direction > 0
+            self.keys.up = self.rng.random() < 0.2
+            self.keys.space = self.rng.random() < 0.5
+        self.frame += 1
+        return self.keys
+
+
+def play(input_states, seed):
+    """
+    Step games through a sequence of inputs as fast as possible.
+
+    A new game is started whenever the player runs out of lives, as
+    PlayScreen would do via the game over screen. The first game uses seed
+    itself and later games use sub-streams derived from it, so the whole
+    run is reproducible from the seed and the inputs.
+
+    Args:
+        input_states: Iterable of InputState, one per Game.update call
+        seed: Random seed
+
+    Returns:
+        Dict of run statistics
+    """
+    game = Game(Player(), seed=seed)
+    frames = 0
+    games = 1
+    best_level = 0
+    pool_hits = pool_misses = 0
+
+    start = time.perf_counter()
+    for input_state in input_states:
+        game.update(input_state, null_sound)
+        frames += 1
+
+        if game.player.lives < 0:
+            best_level = max(best_level, game.level)
+            for hits, misses in game.pool_stats().values():
+                pool_hits += hits
+                pool_misses += misses
+            game = Game(Player(), seed=derive_seed(seed, "game", games))
+            games += 1
+    elapsed = time.perf_counter() - start
+
+    for hits, misses in game.pool_stats().values():
+        pool_hits += hits
+        pool_misses += misses
+
+    return {
+        "frames": frames,
+        "seconds": elapsed,
+        "ticks_per_sec": frames / elapsed if elapsed > 0 else float("inf"),
+        "games": games,
+        "level": max(best_level, game.level) + 1,
+        "score": game.player.score,
+        "pool_hits": pool_hits,
+        "pool_misses": pool_misses,
+    }
+
+
+def run(frames, seed, policy="random", record=None):
+    """
+    Run a headless session.
+
+    Args:
+        frames: Number of Game.update calls to make
+        seed: Random seed
+        policy: "random" to mash keys, "idle" for no input
+        record: Optional path to record the inputs to, for src.replay
+
+    Returns:
+        Dict of run statistics (see play())
+    """
+    keyboard = RandomKeyboard(random.Random(seed))
+    idle_keys = SimpleNamespace(left=False, right=False, up=False, space=False, p=False)
+    recorder = InputRecorder(record, seed, TARGET_GAME) if record else None
+    input_manager = InputManager(recorder)
+
+    def input_states():
+        for _ in range(frames):
+            keys = keyboard.next() if policy == "random" else idle_keys
+            yield input_manager.get_input_state(keys)
+
+    try:
+        return play(input_states(), seed)
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Cavern headless and report ticks/sec.")
+    parser.add_argument("--frames", type=int, default=10000, help="number of frames to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--policy", choices=["random", "idle"], default="random",
+                        help="input policy for the player")
+    parser.add_argument("--record", metavar="PATH", help="record the inputs for src.replay")
+    args = parser.parse_args(argv)
+
+    stats = run(args.frames, args.seed, args.policy, args.record)
+    print(f"{stats['frames']} frames in {stats['seconds']:.3f}s "
+          f"({stats['ticks_per_sec']:.0f} ticks/sec)")
+    print(f"games: {stats['games']}  best level: {stats['level']}  final score: {stats['score']}")
+    print(f"entity pool: {stats['pool_hits']} hits, {stats['pool_misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,331 @@
 """Sound management for Cavern game."""
-from random import randint
+import os
+import time
+from collections import OrderedDict
+
+from src.assets import SOUNDS_DIR
+from src.rng import make_rng
+
+# When every channel is busy, a sound may take over a channel playing one of
+# the same or lower priority. Sounds not listed have DEFAULT_SOUND_PRIORITY.
+SOUND_PRIORITIES = {
+    "over": 3, "level": 3, "die": 3,
+    "life": 2, "ouch": 2, "bonus": 2, "score": 2,
+    "trap": 1, "pop": 1, "blow": 1, "appear": 1, "vanish": 1,
+    "laser": 0, "jump": 0, "land": 0,
+}
+DEFAULT_SOUND_PRIORITY = 1
+
+# Mixer channels sound effects may use (music streams separately)
+CHANNEL_BUDGET = 8
+
+# Most sounds started by one flush(); the lowest priority ones are dropped
+MAX_SOUNDS_PER_FRAME = 4
+
+# Sounds whose variants a SoundCache never evicts, as they play constantly
+PINNED_SOUNDS = ("blow", "pop", "laser")
+
+
+class SoundCache:
+    """
+    Decoded sound effects, kept within a memory budget.
+    
+    Pygame decodes a whole effect to PCM when it is loaded, and Pygame
+    Zero's loader keeps every effect forever. This cache decodes effects on
+    first use and evicts the least recently used ones to stay within its
+    budget, except for pinned sounds, which stay once decoded.
+    """
+    
+    def __init__(self, budget_bytes, pinned=PINNED_SOUNDS, directory=SOUNDS_DIR):
+        """
+        Args:
+            budget_bytes: Most decoded audio to keep, in bytes
+            pinned: Base names of sounds (e.g. "pop" for pop0 to pop3) never evicted
+            directory: Directory of .ogg sound effects
+        """
+        self.budget_bytes = budget_bytes
+        self.pinned = tuple(pinned)
+        self.directory = directory
+        
+        # Name -> (Sound, bytes), least recently used first
+        self._sounds = OrderedDict()
+        self._pinned = {}
+        
+        # Counters
+        self.resident_bytes = 0
+        self.pinned_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.decode_seconds = 0.0
+    
+    def _path(self, name):
+        return os.path.join(self.directory, name + ".ogg")
+    
+    def exists(self, name):
+        return os.path.exists(self._path(name))
+    
+    def is_pinned(self, name):
+        return name.rstrip("0123456789") in self.pinned
+    
+    def get(self, name):
+        """
+        Get a decoded sound, decoding it if it isn't resident.
+        
+        Raises:
+            pygame.error: If the sound can't be decoded (or there is no mixer)
+        """
+        sound = self._pinned.get(name)
+        if sound is not None:
+            self.hits += 1
+            return sound
+        entry = self._sounds.get(name)
+        if entry is not None:
+            self.hits += 1
+            self._sounds.move_to_end(name)
+            return entry[0]
+        
+        self.misses += 1
+        sound, size = self._decode(name)
+        self.resident_bytes += size
+        if self.is_pinned(name):
+            self._pinned[name] = sound
+            self.pinned_bytes += size
+            if self.pinned_bytes > self.budget_bytes >= self.pinned_bytes - size:
+                print(f"Warning: the pinned sounds don't fit in the sound cache budget of "
+                      f"{self.budget_bytes // 1024} KB, so other sounds are decoded on every play")
+        else:
+            self._sounds[name] = (sound, size)
+            self._evict()
+        return sound
+    
+    def _decode(self, name):
+        """Load a sound and work out how much memory its PCM takes."""
+        import pygame
+        start = time.perf_counter()
+        sound = pygame.mixer.Sound(self._path(name))
+        self.decode_seconds += time.perf_counter() - start
+        
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        size = round(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+        return sound, size
+    
+    def _evict(self):
+        """
+        Drop least recently used sounds until within budget.
+        
+        Pinned sounds and the sound just used stay, so if those alone are
+        over budget, the cache is over by that much rather than decoding
+        the same sound on every play.
+        """
+        # Channels hold a reference to what they are playing, so evicting a
+        # sound never cuts it off
+        while self.resident_bytes > self.budget_bytes and len(self._sounds) > 1:
+            _, (_, size) = self._sounds.popitem(last=False)
+            self.resident_bytes -= size
+            self.evictions += 1
+    
+    def preload_pinned(self):
+        """Decode every variant of the pinned sounds now rather than in play."""
+        for filename in sorted(os.listdir(self.directory)):
+            name, extension = os.path.splitext(filename)
+            if extension == ".ogg" and self.is_pinned(name):
+                self.get(name)
+    
+    def stats(self):
+        """
+        Get cache counters.
+        
+        Returns:
+            Dict of resident and pinned bytes, hits, misses, evictions and
+            total seconds spent decoding
+        """
+        return {"resident_bytes": self.resident_bytes, "pinned_bytes": self.pinned_bytes,
+                "budget_bytes": self.budget_bytes, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "decode_seconds": self.decode_seconds}
 
 
 class SoundManager:
-    """Manages game sound effects and music."""
+    """
+    Manages game sound effects and music.
+    
+    play_sound() only queues a sound; flush() plays the frame's queue once
+    the update is done. Repeated requests for the same sound within a frame
+    are merged, so a burst of pops or lasers plays each sound once. Headless
+    code passes src.sim.null_sound as the callback instead, which does nothing.
+    """
     
-    def __init__(self, sounds_module):
+    def __init__(self, sounds_module, seed=None, channels=CHANNEL_BUDGET,
+                 max_per_frame=MAX_SOUNDS_PER_FRAME, cache_bytes=None):
         """
         Initialize sound manager.
         
         Args:
             sounds_module: Pygame Zero sounds module
+            seed: Seed for choosing sound variants, or None for a random one
+            channels: Number of mixer channels to play effects on
+            max_per_frame: Most sounds started per flush()
+            cache_bytes: Memory budget for decoded effects, kept in a
+                SoundCache; None loads them through sounds_module, which
+                keeps every effect once used
         """
         self.sounds = sounds_module
+        self.cache = SoundCache(cache_bytes) if cache_bytes is not None else None
+        
+        # Separate from the game's stream, so playing sounds (or not, when
+        # running headless) never changes how a game plays out
+        self.rng = make_rng(seed)
+        
+        self.channel_budget = channels
+        self.max_per_frame = max_per_frame
+        
+        # Sound name -> variant count, in the order first requested this frame
+        self._queue = {}
+        
+        # (name, count) -> tuple with a handle for each variant: the Sound,
+        # or its name when the cache decides what stays loaded (None if missing)
+        self._handles = {}
+        
+        # Mixer channels, opened on first use, with the priority of what each
+        # last played and when it started (in sounds played)
+        self._channels = None
+        self._channel_priority = []
+        self._channel_started = []
+        
+        # Counters
+        self.requested = 0
+        self.coalesced = 0
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
     
     def play_sound(self, name, count=1):
         """
-        Play a sound effect.
+        Queue a sound effect to play at the end of the frame.
         
         Args:
             name: Base name of sound file
             count: Number of variants (will randomly choose one)
         """
+        self.requested += 1
+        if name in self._queue:
+            self.coalesced += 1
+        else:
+            self._queue[name] = count
+    
+    def flush(self):
+        """Play the sounds queued this frame, highest priority first."""
+        queue = self._queue
+        if not queue:
+            return
+        
+        events = list(queue.items())
+        queue.clear()
+        if len(events) > self.max_per_frame:
+            # Stable sort, so equal priorities keep their request order
+            events.sort(key=lambda event: SOUND_PRIORITIES.get(event[0], DEFAULT_SOUND_PRIORITY),
+                        reverse=True)
+            self.dropped += len(events) - self.max_per_frame
+            del events[self.max_per_frame:]
+        
+        cache = self.cache
+        for name, count in events:
+            handles = self._resolve(name, count)
+            variant = self.rng.randint(0, count - 1)
+            handle = handles[variant]
+            if handle is None:
+                continue
+            if cache is not None:
+                try:
+                    handle = cache.get(handle)
+                except Exception as e:
+                    # Reported once; from now on the variant counts as missing
+                    print(f"Sound could not be loaded: {e}")
+                    self._handles[name, count] = handles[:variant] + (None,) + handles[variant + 1:]
+                    continue
+            self._play(handle, SOUND_PRIORITIES.get(name, DEFAULT_SOUND_PRIORITY))
+    
+    def _resolve(self, name, count):
+        """Look up the handle for each variant of a sound, once."""
+        key = (name, count)
+        handles = self._handles.get(key)
+        if handles is None:
+            resolved = []
+            for variant in range(count):
+                variant_name = name + str(variant)
+                if self.cache is not None:
+                    if self.cache.exists(variant_name):
+                        resolved.append(variant_name)
+                        continue
+                    error = f"no sound file for '{variant_name}'"
+                else:
+                    try:
+                        resolved.append(getattr(self.sounds, variant_name))
+                        continue
+                    except Exception as e:
+                        error = e
+                # Reported once here rather than every time it would play
+                print(f"Sound not found: {error}")
+                resolved.append(None)
+            handles = self._handles[key] = tuple(resolved)
+        return handles
+    
+    def _open_channels(self):
+        """Reserve the channel budget on the mixer; no channels if there is no mixer."""
+        import pygame
         try:
-            sound_name = name + str(randint(0, count - 1))
-            sound = getattr(self.sounds, sound_name)
-            sound.play()
-        except Exception as e:
-            # Silently ignore missing sounds
-            print(f"Sound not found: {e}")
+            pygame.mixer.set_num_channels(self.channel_budget)
+            self._channels = [pygame.mixer.Channel(i) for i in range(self.channel_budget)]
+        except pygame.error:
+            self._channels = []
+        self._channel_priority = [0] * len(self._channels)
+        self._channel_started = [0] * len(self._channels)
+    
+    def _play(self, sound, priority):
+        """Play a sound on a free channel, or steal the least important one."""
+        if self._channels is None:
+            self._open_channels()
+        channels = self._channels
+        if not channels:
+            return
+        
+        for i, channel in enumerate(channels):
+            if not channel.get_busy():
+                break
+        else:
+            # Lowest priority, then longest playing
+            i = min(range(len(channels)),
+                    key=lambda i: (self._channel_priority[i], self._channel_started[i]))
+            if self._channel_priority[i] > priority:
+                self.dropped += 1
+                return
+            self.stolen += 1
+        
+        channels[i].play(sound)
+        self.played += 1
+        self._channel_priority[i] = priority
+        self._channel_started[i] = self.played
+    
+    @property
+    def decode_seconds(self):
+        """Total time spent decoding effects in the cache (0 without one)."""
+        return self.cache.decode_seconds if self.cache is not None else 0.0
+    
+    @property
+    def resident_bytes(self):
+        """Decoded audio held by the cache, or None without one (not tracked)."""
+        return self.cache.resident_bytes if self.cache is not None else None
+    
+    def stats(self):
+        """
+        Get sound counters.
+        
+        Returns:
+            Dict of requests, merged duplicates, sounds played, channels
+            stolen and sounds dropped, plus the cache's counters if there is one
+        """
+        stats = {"requested": self.requested, "coalesced": self.coalesced, "played": self.played,
+                 "stolen": self.stolen, "dropped": self.dropped}
+        if self.cache is not None:
+            stats.update(self.cache.stats())
+        return stats
@@ -0,0 +1,92 @@
+"""Broad-phase spatial indexing for Cavern game."""
+
+CELL_SIZE = 100
+
+
+class SpatialHash:
+    """Uniform grid of cells mapping screen areas to the objects that cover them."""
+    
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+    
+    def clear(self):
+        """Remove all objects."""
+        self.cells.clear()
+        self.count = 0
+    
+    def insert(self, obj, left, top, right, bottom):
+        """
+        Add an object covering the rectangle [left, right) x [top, bottom).
+        
+        A point can be inserted by passing right == left and bottom == top.
+        """
+        entry = (self.count, obj, left, top, right, bottom)
+        self.count += 1
+        size = self.cell_size
+        for cell_y in range(int(top // size), int(bottom // size) + 1):
+            for cell_x in range(int(left // size), int(right // size) + 1):
+                cell = self.cells.get((cell_x, cell_y))
+                if cell is None:
+                    self.cells[(cell_x, cell_y)] = [entry]
+                else:
+                    cell.append(entry)
+    
+    def query_point(self, x, y):
+        """Get objects whose rectangle contains the point, in insertion order."""
+        size = self.cell_size
+        cell = self.cells.get((int(x // size), int(y // size)))
+        if not cell:
+            return []
+        return [entry[1] for entry in cell
+                if entry[2] <= x < entry[4] and entry[3] <= y < entry[5]]
+    
+    def query_rect(self, left, top, right, bottom):
+        """
+        Get candidate objects that may overlap the rectangle, in insertion order.
+        
+        This is a broad-phase test: callers must still do their exact check.
+        """
+        size = self.cell_size
+        cells = self.cells
+        found = {}
+        for cell_y in range(int(top // size), int(bottom // size) + 1):
+            for cell_x in range(int(left // size), int(right // size) + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell:
+                    for entry in cell:
+                        found[entry[0]] = entry[1]
+        return [found[i] for i in sorted(found)]
+
+
+class OrbIndex:
+    """
+    Per-frame index of orb hitboxes and centres.
+    
+    Built once per Game.update after the player has moved (and possibly
+    fired), so it stays valid for fruits, bolts and enemies, which don't
+    move orbs. Query results keep the order of the orbs list.
+    """
+    
+    def __init__(self):
+        self.hitboxes = SpatialHash()
+        self.centres = SpatialHash()
+    
+    def build(self, orbs):
+        """Index the given orbs, replacing the previous contents."""
+        self.hitboxes.clear()
+        self.centres.clear()
+        for orb in orbs:
+            left, top = orb.topleft
+            self.hitboxes.insert(orb, left, top, left + orb.width, top + orb.height)
+            x, y = orb.center
+            self.centres.insert(orb, x, y, x, y)
+    
+    def orbs_at(self, point):
+        """Get orbs whose hitbox contains the point."""
+        return self.hitboxes.query_point(*point)
+    
+    def orbs_near(self, left, top, right, bottom):
+        """Get candidate orbs whose centre may lie within the rectangle."""
+        return self.centres.query_rect(left, top, right, bottom)
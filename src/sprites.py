@@ -0,0 +1,43 @@
+"""Sprite metadata for Cavern game.
+
+The simulation only needs to know how big each sprite is (hitboxes and anchors
+depend on it), not what it looks like. Sizes are read straight from the PNG
+headers in ``images/`` so that no pygame surface is ever created outside of
+rendering.
+"""
+import os
+import struct
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_sizes = {}
+
+
+def _read_png_size(path):
+    """Return (width, height) from the IHDR chunk of a PNG file."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if len(header) < 24 or header[:8] != _PNG_SIGNATURE:
+        raise ValueError(f"Not a PNG file: {path}")
+    return struct.unpack(">II", header[16:24])
+
+
+def sprite_size(name):
+    """
+    Get the size of a sprite by name.
+
+    Args:
+        name: Image name as used by Pygame Zero (file name without extension)
+
+    Returns:
+        (width, height) tuple
+    """
+    size = _sizes.get(name)
+    if size is None:
+        path = os.path.join(IMAGES_DIR, name + ".png")
+        if not os.path.exists(path):
+            raise KeyError(f"No image found for '{name}'")
+        size = _sizes[name] = _read_png_size(path)
+    return size
@@ -0,0 +1,120 @@
+"""
+Fixed-timestep driving of the simulation, independent of the render rate.
+
+Game logic counts ticks (timer % 81, hurt timers, orb lifetimes), so it
+must tick at a steady rate whatever the frame rate is. FixedTimestep turns
+the real time between frames into a whole number of ticks, carrying the
+remainder over; after a slow frame it runs several ticks to catch up, and
+when frames come faster than ticks it runs none.
+
+Between ticks, PositionInterpolator can draw entities part of the way from
+where they were on the previous tick to where they are now, so motion stays
+smooth when the display refreshes faster than the simulation.
+"""
+from contextlib import contextmanager
+
+
+class FixedTimestep:
+    """Accumulates frame time and hands it out as fixed-length ticks."""
+
+    def __init__(self, tick_rate=60, max_ticks=5, snap=0.002):
+        """
+        Args:
+            tick_rate: Simulation ticks per second
+            max_ticks: Most ticks run for one frame. Time beyond that is
+                dropped, so after a long stall (e.g. dragging the window) the
+                game slows down briefly instead of running hundreds of ticks.
+            snap: Frame times within this many seconds of one tick count as
+                exactly one tick. Frame timers are only accurate to a
+                millisecond or so, and at a refresh rate matching the tick
+                rate the jitter would otherwise give the odd frame with no
+                tick followed by one with two.
+        """
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+        self.tick_rate = tick_rate
+        self.tick_seconds = 1 / tick_rate
+        self.max_ticks = max_ticks
+        self.snap = snap
+        self.accumulator = 0.0
+        self.dropped_seconds = 0.0
+
+    def advance(self, dt):
+        """
+        Add a frame's elapsed time.
+
+        Args:
+            dt: Seconds since the previous frame
+
+        Returns:
+            Number of ticks to run for this frame
+        """
+        if abs(dt - self.tick_seconds) < self.snap:
+            dt = self.tick_seconds
+        self.accumulator += dt
+        # Allow for rounding, so a whole number of ticks' time isn't one short
+        ticks = int(self.accumulator / self.tick_seconds + 1e-9)
+        if ticks > self.max_ticks:
+            self.dropped_seconds += (ticks - self.max_ticks) * self.tick_seconds
+            ticks = self.max_ticks
+            # Keep only the fraction of a tick left after the last one
+            self.accumulator %= self.tick_seconds
+        else:
+            self.accumulator -= ticks * self.tick_seconds
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far the current time is between the last tick and the next, 0 to 1."""
+        return min(max(self.accumulator / self.tick_seconds, 0.0), 1.0)
+
+
+class PositionInterpolator:
+    """Draws a game's entities between their previous and current tick positions."""
+
+    # Entities that moved further than this in one tick (respawned, wrapped
+    # around the screen or recycled from a pool) are drawn where they are
+    MAX_DISTANCE = 32
+
+    def __init__(self):
+        self._previous = {}
+
+    def capture(self, game):
+        """Remember where every entity is, just before the last tick of a frame."""
+        previous = self._previous
+        previous.clear()
+        for entities in (game.fruits, game.bolts, game.enemies, game.pops, game.orbs):
+            for entity in entities:
+                previous[entity] = (entity.x, entity.y)
+        if game.player:
+            previous[game.player] = (game.player.x, game.player.y)
+
+    @contextmanager
+    def interpolated(self, game, alpha):
+        """
+        Move entities to their interpolated positions for the duration of a draw.
+
+        The real positions are put back afterwards, so the simulation is
+        unaffected.
+
+        Args:
+            game: Game passed to the last capture()
+            alpha: Fraction of the way from the captured positions to the current ones
+        """
+        moved = []
+        limit = self.MAX_DISTANCE
+        for entity, (x0, y0) in self._previous.items():
+            x, y = entity.x, entity.y
+            if (x, y) != (x0, y0) and abs(x - x0) <= limit and abs(y - y0) <= limit:
+                moved.append((entity, x, y))
+                entity.x = round(x0 + (x - x0) * alpha)
+                entity.y = round(y0 + (y - y0) * alpha)
+        try:
+            yield
+        finally:
+            for entity, x, y in moved:
+                entity.x = x
+                entity.y = y
+
+    def clear(self):
+        self._previous.clear()
@@ -0,0 +1,331 @@
+"""
+Shared-memory ring buffer for streaming experience to another process.
+
+A simulation worker pushes (observation, action, reward, done) steps into a
+ring held in multiprocessing.shared_memory; a trainer process attaches by
+name and reads batches as NumPy views of that memory, so nothing is pickled
+or copied on the way out.
+
+Each ring has exactly one producer and one consumer (use one ring per
+worker). The protocol is lock-free: the header holds two counters that only
+ever increase. The producer writes a slot, then advances head to publish
+it; the consumer reads slots between tail and head, then advances tail to
+give them back. Each counter has a single writer, and its 8-byte aligned
+stores are atomic.
+
+Publishing by advancing head also relies on the reader seeing the slot's
+stores before the new head, which Python has no barrier to enforce. x86
+guarantees it (stores become visible in program order), but weakly ordered
+CPUs such as ARM do not, so rings refuse to open anywhere else.
+
+Usage (demo with simulation workers feeding this process):
+    python -m src.transport --workers 2 --steps 20000 [--capacity 1024]
+"""
+import argparse
+import platform
+import sys
+import time
+from multiprocessing import Process, shared_memory
+
+import numpy as np
+
+# Header: head, tail, capacity, closed flag, observation ndim and up to 3 dims
+_HEADER_FIELDS = 8
+_HEAD, _TAIL, _CAPACITY, _CLOSED, _NDIM = range(5)
+_MAX_NDIM = 3
+_ALIGN = 64
+
+# Machines (as named by platform.machine()) whose stores are seen in order
+_STORE_ORDERED_MACHINES = {"x86_64", "amd64", "i386", "i686", "x86"}
+
+# Seconds to wait before looking at a full (or, for the consumer, empty) ring again
+POLL_SECONDS = 0.0005
+
+
+def _check_store_order():
+    machine = platform.machine()
+    if machine.lower() not in _STORE_ORDERED_MACHINES:
+        raise RuntimeError(f"ExperienceRing relies on x86 store ordering and can't run on {machine!r}")
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _layout(capacity, obs_shape):
+    """Byte offsets of the arrays in the shared block, and its total size."""
+    offsets = {}
+    offset = _aligned(_HEADER_FIELDS * 8)
+    for name, shape, dtype in (("observations", (capacity,) + tuple(obs_shape), np.uint8),
+                               ("actions", (capacity,), np.int16),
+                               ("rewards", (capacity,), np.float32),
+                               ("dones", (capacity,), np.uint8)):
+        offsets[name] = (offset, shape, dtype)
+        offset = _aligned(offset + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+    return offsets, offset
+
+
+class ExperienceRing:
+    """Ring of steps in shared memory, written by one process and read by another."""
+
+    def __init__(self, capacity, obs_shape, name=None):
+        """
+        Create a new ring.
+
+        Args:
+            capacity: Number of steps the ring holds
+            obs_shape: Shape of one uint8 observation, e.g. ObservationEncoder planes
+            name: Shared memory name (default: chosen by the system)
+        """
+        _check_store_order()
+        if len(obs_shape) > _MAX_NDIM:
+            raise ValueError(f"observations can have at most {_MAX_NDIM} dimensions")
+        _, size = _layout(capacity, obs_shape)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._owner = True
+        self._map(capacity, obs_shape)
+
+        header = self._header
+        header[:] = 0
+        header[_CAPACITY] = capacity
+        header[_NDIM] = len(obs_shape)
+        header[_NDIM + 1:_NDIM + 1 + len(obs_shape)] = obs_shape
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Open a ring created by another process.
+
+        Args:
+            name: The creating ring's name
+        """
+        _check_store_order()
+        ring = cls.__new__(cls)
+        ring._shm = _open_shared_memory(name)
+        ring._owner = False
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=ring._shm.buf)
+        ndim = int(header[_NDIM])
+        obs_shape = tuple(int(dim) for dim in header[_NDIM + 1:_NDIM + 1 + ndim])
+        ring._map(int(header[_CAPACITY]), obs_shape)
+        return ring
+
+    def _map(self, capacity, obs_shape):
+        buf = self._shm.buf
+        self.capacity = capacity
+        self.obs_shape = tuple(obs_shape)
+        self._header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buf)
+        offsets, _ = _layout(capacity, obs_shape)
+        for name, (offset, shape, dtype) in offsets.items():
+            setattr(self, name, np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset))
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def __len__(self):
+        """Number of steps written but not yet released."""
+        return int(self._header[_HEAD] - self._header[_TAIL])
+
+    @property
+    def closed(self):
+        """True once the producer has called finish()."""
+        return bool(self._header[_CLOSED])
+
+    # Producer side
+
+    def push(self, observation, action, reward, done, block=True):
+        """
+        Append one step.
+
+        Args:
+            observation: Array of obs_shape (copied into the ring)
+            action: Action index
+            reward: Reward for the step
+            done: Whether the episode ended
+            block: Wait for the consumer if the ring is full; if False,
+                return False instead
+
+        Returns:
+            True if the step was written
+        """
+        header = self._header
+        head = int(header[_HEAD])
+        while head - int(header[_TAIL]) >= self.capacity:
+            if not block:
+                return False
+            time.sleep(POLL_SECONDS)
+
+        slot = head % self.capacity
+        self.observations[slot] = observation
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.dones[slot] = done
+        # Publish only after the slot is written
+        header[_HEAD] = head + 1
+        return True
+
+    def finish(self):
+        """Tell the consumer no more steps are coming."""
+        self._header[_CLOSED] = 1
+
+    # Consumer side
+
+    def peek(self, max_steps=None):
+        """
+        Views of the oldest unread steps, without copying.
+
+        The views stay valid until release(); at most the steps up to the
+        end of the ring are returned, so call again after a wrap.
+
+        Args:
+            max_steps: Upper limit on the batch size
+
+        Returns:
+            Tuple of (observations, actions, rewards, dones) array views,
+            possibly empty
+        """
+        header = self._header
+        tail = int(header[_TAIL])
+        available = int(header[_HEAD]) - tail
+        start = tail % self.capacity
+        count = min(available, self.capacity - start)
+        if max_steps is not None:
+            count = min(count, max_steps)
+        end = start + count
+        return (self.observations[start:end], self.actions[start:end],
+                self.rewards[start:end], self.dones[start:end])
+
+    def release(self, count):
+        """Give the oldest count steps back to the producer."""
+        self._header[_TAIL] += count
+
+    def close(self):
+        """Detach from the shared memory, and free it if this process created it."""
+        # Drop the views first, or the memory can't be closed
+        self._header = self.observations = self.actions = self.rewards = self.dones = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _open_shared_memory(name):
+    """Attach to existing shared memory without letting this process free it at exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Before Python 3.13 attaching registers the block with the resource
+    # tracker, which frees it when the attaching process exits (and confuses
+    # the creator's tracker if they share one), so skip the registration
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def run_worker(ring_name, seed, steps, resolution=1, frame_skip=4):
+    """
+    Play random actions in a CavernEnv and stream the steps into a ring.
+
+    Args:
+        ring_name: Name of an ExperienceRing created by the consumer
+        seed: Environment seed
+        steps: Number of env steps to produce
+        resolution: ObservationEncoder resolution (must match the ring)
+        frame_skip: Frames per step
+    """
+    from src.env import ACTIONS, CavernEnv
+    from src.observation import ObservationEncoder
+    from src.rng import make_rng
+
+    ring = ExperienceRing.attach(ring_name)
+    try:
+        env = CavernEnv(frame_skip=frame_skip, observe=ObservationEncoder(resolution).encode)
+        rng = make_rng(seed, "actions")
+        env.reset(seed)
+        for _ in range(steps):
+            action = rng.randrange(len(ACTIONS))
+            observation, reward, done, _ = env.step(action)
+            ring.push(observation, action, reward, done)
+            if done:
+                env.reset()
+    finally:
+        # Even after an error, so the consumer stops waiting for this ring
+        ring.finish()
+        ring.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream experience from workers through shared memory.")
+    parser.add_argument("--workers", type=int, default=2, help="simulation processes")
+    parser.add_argument("--steps", type=int, default=20000, help="env steps per worker")
+    parser.add_argument("--capacity", type=int, default=1024, help="steps per ring")
+    parser.add_argument("--resolution", type=int, default=1, help="observation cells per tile")
+    parser.add_argument("--seed", type=int, default=0, help="seed of worker 0; worker i uses seed + i")
+    args = parser.parse_args(argv)
+
+    from src.observation import ObservationEncoder
+    obs_shape = ObservationEncoder(args.resolution).planes.shape
+
+    rings = [ExperienceRing(args.capacity, obs_shape) for _ in range(args.workers)]
+    workers = [Process(target=run_worker, args=(ring.name, args.seed + i, args.steps, args.resolution))
+               for i, ring in enumerate(rings)]
+
+    received = episodes = batches = 0
+    reward_total = 0.0
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    try:
+        active = list(zip(rings, workers))
+        while active:
+            idle = True
+            for ring, worker in list(active):
+                # Checked before reading, so whatever a worker pushed before
+                # it died is read before its ring is dropped
+                alive = worker.is_alive()
+                observations, actions, rewards, dones = ring.peek()
+                count = len(rewards)
+                if count:
+                    # A trainer would consume the views here
+                    received += count
+                    reward_total += float(rewards.sum())
+                    episodes += int(dones.sum())
+                    batches += 1
+                    ring.release(count)
+                    idle = False
+                elif len(ring) == 0 and (ring.closed or not alive):
+                    # A worker killed outright never finishes its ring
+                    active.remove((ring, worker))
+            if idle:
+                time.sleep(POLL_SECONDS)
+    finally:
+        for worker in workers:
+            worker.join()
+        for ring in rings:
+            ring.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{received} steps from {args.workers} workers in {elapsed:.3f}s "
+          f"({received / elapsed:.0f} steps/sec, {batches} batches)")
+    print(f"episodes finished: {episodes}  total reward: {reward_total:.1f}")
+
+    failed = [i for i, worker in enumerate(workers) if worker.exitcode != 0]
+    for i in failed:
+        print(f"worker {i} failed with exit code {workers[i].exitcode}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,8 @@ def block(x, y, grid):
     """Check if there is a level grid block at these coordinates."""
     grid_x = (x - LEVEL_X_OFFSET) // GRID_BLOCK_SIZE
     grid_y = y // GRID_BLOCK_SIZE
-    if grid_y > 0 and grid_y < NUM_ROWS:
-        row = grid[grid_y]
-        return grid_x >= 0 and grid_x < NUM_COLUMNS and len(row) > 0 and row[grid_x] != " "
+    if 0 < grid_y < NUM_ROWS and 0 <= grid_x < NUM_COLUMNS:
+        return grid.solid[grid_y * NUM_COLUMNS + grid_x] != 0
     else:
         return False
 
@@ -25,14 +24,20 @@ def char_width(char):
     return CHAR_WIDTH[index]
 
 
+def text_width(text):
+    """Return width of a string in the font."""
+    return sum(char_width(char) for char in text)
+
+
 def draw_text(screen, text, y, x=None):
-    """Draw text on screen using custom font."""
-    from src.constants import WIDTH
+    """
+    Draw text on screen using custom font.
     
-    if x is None:
-        # Center text if no X position specified
-        x = (WIDTH - sum([char_width(c) for c in text])) // 2
+    The string is rendered from the glyph atlas once and cached, so
+    redrawing the same text in the same place is a single blit.
+    """
+    # Imported here so the simulation can use this module without pygame
+    from src.render import placed_text
     
-    for char in text:
-        screen.blit("font0" + str(ord(char)), (x, y))
-        x += char_width(char)
+    surface, pos = placed_text(text, y, x)
+    screen.blit(surface, pos)
@@ -0,0 +1,28 @@
+"""Tests for the rewards given by CavernEnv."""
+from src.env import ACTIONS, CavernEnv
+
+IDLE = ACTIONS.index((0, False, False))
+
+
+def finish_level(game):
+    """Leave nothing on the level, so the next update completes it."""
+    game.pending_enemies.clear()
+    game.enemies.clear()
+    game.fruits.clear()
+    game.pops.clear()
+    game.trapped_orbs = 0
+
+
+def test_level_change_refill_is_not_rewarded():
+    env = CavernEnv(frame_skip=1)
+    env.reset(0)
+    env.game.player.health = 1
+    finish_level(env.game)
+
+    _, reward, done, info = env.step(IDLE)
+
+    assert info["level"] == 2
+    assert info["health"] == 3
+    assert reward == 0
+    assert not done
+